@@ -1,29 +1,45 @@
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
-from scipy.stats import zscore
+import plotly.io as pio
 import dash
-from dash import dcc, html, dash_table
-from dash.dependencies import Input, Output, State
+from dash import dcc, html, dash_table, ctx
+from dash.dependencies import Input, Output, State, ClientsideFunction
 import base64
+import hashlib
 import io
+from functools import lru_cache
 import dash_bootstrap_components as dbc
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pacsv
+from tsdownsample import LTTBDownsampler
 from dashboard import get_dashboard_layout, _empty_fig, GRAPH_HEIGHT
 from login import get_login_layout, get_register_layout, register_login_callbacks
 from settings import get_settings_layout
 from insights import get_insights_layout
+from cache import cache, CACHE_CONFIG
+from kernels import zscore_columns, threshold_mask
 
 # ──────────────────────────────────────────────
 # Initialize Dash App
 # ──────────────────────────────────────────────
+# Dash serialises every response through plotly's JSON encoder; pin it to
+# orjson (numpy arrays natively, figure arrays as base64 typed arrays)
+# instead of relying on 'auto' silently falling back to stdlib json.
+pio.json.config.default_engine = 'orjson'
+
 app = dash.Dash(
     __name__,
     title="Anomaly Detector",
     external_stylesheets=[dbc.themes.CYBORG],
     suppress_callback_exceptions=True,
+    # report.css styles the downloaded HTML report only; serve it, never inject it.
+    assets_ignore=r'report\.css',
+    # gzip layout, callback and asset responses (needs flask-compress).
+    compress=True,
 )
 server = app.server
+cache.init_app(server, config=CACHE_CONFIG)
 
 styles = {
     'background':   '#1a1a2e',
@@ -40,6 +56,17 @@ styles = {
     'sidebar_text': '#ffffff',
 }
 
+# Shared dark theme for every analysis figure; built once at import so
+# callbacks don't re-create and re-validate the same layout per figure.
+DARK_LAYOUT = go.Layout(
+    plot_bgcolor=styles['card_bg'],
+    paper_bgcolor=styles['card_bg'],
+    font={'color': styles['text']},
+    height=GRAPH_HEIGHT,
+    margin=dict(l=20, r=20, t=50, b=20),
+)
+LABEL_COLORS = {'Normal': '#90ee90', 'Abnormal': styles['danger']}
+
 # ──────────────────────────────────────────────
 # index_string
 # ALL global CSS and the sidebar-toggle JS must
@@ -277,6 +304,8 @@ app.layout = html.Div([
     dcc.Store(id='login-state',            data={'logged_in': False}),
     dcc.Store(id='stored-data'),
     dcc.Store(id='numeric-cols'),
+    dcc.Store(id='pretty-names'),
+    dcc.Store(id='zscore-store'),
     dcc.Store(id='anomalous-data-store'),
     dcc.Store(id='download-report-trigger'),
 ])
@@ -339,12 +368,68 @@ def display_page(pathname, login_state):
 # ──────────────────────────────────────────────
 # File upload
 # ──────────────────────────────────────────────
+def _parse_upload(decoded):
+    """Parse uploaded CSV bytes into the cache and return (key, df, numeric_columns).
+
+    Entries are keyed by the SHA-1 of the bytes, so re-uploading the same
+    file reuses the cached frame and z-scores instead of parsing again.
+    """
+    key = hashlib.sha1(decoded).hexdigest()
+    df = cache.get(key)
+
+    if df is None or not cache.has(f"{key}:z") or not cache.has(f"{key}:rank"):
+        # Arrow parses the raw bytes with a multi-threaded reader; no utf-8 decode copy.
+        # Doubles are narrowed to float32 while still columnar, so pandas never
+        # materialises a float64 copy; self_destruct frees each Arrow column
+        # as soon as it has been converted.
+        table = pacsv.read_csv(io.BytesIO(decoded), read_options=pacsv.ReadOptions(use_threads=True))
+        table = table.cast(pa.schema([
+            field.with_type(pa.float32()) if pa.types.is_float64(field.type) else field
+            for field in table.schema
+        ]))
+        df = table.to_pandas(split_blocks=True, self_destruct=True)
+        del table
+        numeric_columns = df.select_dtypes(include=np.number).columns.tolist()
+
+        # All downstream math is statistical, so 32-bit (or narrower) columns
+        # are plenty and halve the cached frame and every pass over it.
+        for col in numeric_columns:
+            kind = df[col].dtype.kind
+            df[col] = pd.to_numeric(df[col], downcast='float' if kind == 'f' else 'integer')
+            if df[col].dtype == np.float64:
+                df[col] = df[col].astype(np.float32)
+
+        # Z-scores don't depend on the threshold, so compute them for every
+        # numeric column once per upload (ddof=0, same as scipy.stats.zscore).
+        # float32 halves memory traffic; NaNs propagate to their own rows.
+        numeric = np.asfortranarray(df[numeric_columns].to_numpy(dtype=np.float32))
+        z_matrix = zscore_columns(numeric)
+
+        # Histogram order for every feature, also fixed per upload: columns ranked
+        # by |Pearson r| with it. For ddof=0 z-scores r is the mean product over
+        # rows where both are present, so one matrix product covers every pair.
+        present = np.isfinite(z_matrix)
+        filled = np.where(present, z_matrix, np.float32(0))
+        present = present.astype(np.float32)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            corr = (filled.T @ filled) / (present.T @ present)
+        ranking = np.argsort(-np.nan_to_num(np.abs(corr)), axis=1, kind='stable')[:, :MAX_HISTOGRAMS]
+
+        # Keep the frame server-side; only the cache key travels through the browser.
+        cache.set(key, df)
+        cache.set(f"{key}:z", z_matrix)
+        cache.set(f"{key}:rank", ranking)
+
+    return key, df, df.select_dtypes(include=np.number).columns.tolist()
+
+
 @app.callback(
     [
         Output('output-data-upload',   'children'),
         Output('feature-dropdown',     'options'),
         Output('stored-data',          'data'),
         Output('numeric-cols',         'data'),
+        Output('pretty-names',         'data'),
         Output('total-rows-kpi',       'children'),
         Output('numeric-features-kpi', 'children'),
     ],
@@ -358,128 +443,259 @@ def handle_file_upload(contents, filename):
     )
 
     if contents is None:
-        return placeholder_msg, [], None, None, "0", "0"
+        return placeholder_msg, [], None, None, None, "0", "0"
 
     _, content_string = contents.split(',')
     decoded = base64.b64decode(content_string)
 
     try:
         if 'csv' in filename.lower():
-            df = pd.read_csv(io.StringIO(decoded.decode('utf-8')))
+            key, df, numeric_columns = _parse_upload(decoded)
         else:
             return (
                 html.Span("Please upload a CSV file.", style={'color': styles['danger']}),
-                [], None, None, "0", "0",
+                [], None, None, None, "0", "0",
             )
     except Exception as e:
         return (
             html.Span(f"Error processing file: {e}", style={'color': styles['danger']}),
-            [], None, None, "0", "0",
+            [], None, None, None, "0", "0",
         )
 
-    numeric_columns = df.select_dtypes(include=np.number).columns.tolist()
+    # Display names are derived once here and reused by every figure and table.
+    pretty_names = {col: col.replace('_', ' ').title() for col in numeric_columns}
 
     return (
         html.Span(
             f"✅ '{filename}' loaded — {len(df):,} rows, {len(numeric_columns)} numeric features.",
             style={'color': styles['success']},
         ),
-        [{'label': col.replace('_', ' ').title(), 'value': col} for col in numeric_columns],
-        df.to_dict('records'),
+        [{'label': pretty_names[col], 'value': col} for col in numeric_columns],
+        {'key': key, 'rows': len(df)},
         numeric_columns,
+        pretty_names,
         f"{len(df):,}",
         str(len(numeric_columns)),
     )
 
 
+SCATTER_MAX_POINTS = 2000   # normal points shipped to the browser per scatter
+MAX_HISTOGRAMS = 6          # distribution cards built per update
+HISTOGRAM_BINS = 50         # fixed bin cap, independent of dataset size
+
+
+def _load_analysis_inputs(data, numeric_cols, selected_feature):
+    """Cached frame and z-score matrix for the current upload, or (None, None) if unusable."""
+    if data is None or selected_feature is None or numeric_cols is None:
+        return None, None
+
+    df = cache.get(data['key'])
+    z_matrix = cache.get(f"{data['key']}:z")
+
+    if df is None or z_matrix is None or selected_feature not in df.columns or df[selected_feature].dtype.kind not in 'iuf':
+        return None, None
+
+    return df, z_matrix
+
+
+class _Unkeyed:
+    """Argument wrapper that lru_cache leaves out of the cache key."""
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __hash__(self):
+        return 0
+
+    def __eq__(self, other):
+        return isinstance(other, _Unkeyed)
+
+
+def _anomaly_rows(key, feature_idx, threshold, z_matrix):
+    """Row positions whose |z| exceeds the threshold for one feature (read-only)."""
+    # The slider can hand over an int (the default is 3); always pass a float so
+    # equal thresholds share a cache entry and only the float64 specialisation
+    # warmed in kernels.py is ever compiled.
+    column_source = _Unkeyed(z_matrix)
+    try:
+        return _cached_anomaly_rows(key, feature_idx, float(threshold), column_source)
+    finally:
+        # lru_cache keeps its arguments in the key; don't let it pin the z-matrix.
+        column_source.value = None
+
+
+# Process-local, keyed on the upload hash, feature and threshold (the z-matrix
+# is identified by the upload key). Kept out of the shared FileSystemCache so
+# slider activity can never evict an upload from it.
+@lru_cache(maxsize=32)
+def _cached_anomaly_rows(key, feature_idx, threshold, column_source):
+    rows = np.flatnonzero(threshold_mask(column_source.value[:, feature_idx], threshold))
+    rows.flags.writeable = False
+    return rows
+
+
+def _scatter_point_indices(x, y, is_anomaly):
+    """Rows to plot: normal points thinned with LTTB, every anomaly kept.
+
+    The payload is bounded by SCATTER_MAX_POINTS plus the anomaly count at
+    the current threshold; rows with a non-finite x or y can't be drawn and
+    are dropped.
+    """
+    normal = ~is_anomaly & np.isfinite(x) & np.isfinite(y)
+    candidates = np.flatnonzero(normal)
+    if len(candidates) <= SCATTER_MAX_POINTS:
+        return np.flatnonzero(is_anomaly | normal)
+
+    # LTTB expects a monotonic x axis.
+    candidates = candidates[np.argsort(x[candidates], kind='stable')]
+    picked = LTTBDownsampler().downsample(x[candidates], y[candidates], n_out=SCATTER_MAX_POINTS)
+    return np.sort(np.concatenate([np.flatnonzero(is_anomaly), candidates[picked]]))
+
+
+# ──────────────────────────────────────────────
+# Scatter plot
+# The server picks and flags the points to plot
+# for the debounced threshold (normals thinned,
+# anomalies in full); the figure itself is built
+# in assets/anomaly.js.
+# ──────────────────────────────────────────────
+@app.callback(
+    Output('zscore-store', 'data'),
+    [
+        Input('stored-data',                 'data'),
+        Input('numeric-cols',                'data'),
+        Input('feature-dropdown',            'value'),
+        Input('z-score-threshold-debounced', 'data'),
+    ],
+    State('pretty-names', 'data'),
+)
+def update_zscore_store(data, numeric_cols, selected_feature, z_score_threshold, pretty_names):
+    df, z_matrix = _load_analysis_inputs(data, numeric_cols, selected_feature)
+    if df is None:
+        return {'placeholder': _empty_fig()}
+
+    feature_idx = numeric_cols.index(selected_feature)
+    z_scores = z_matrix[:, feature_idx]
+
+    scatter_x = selected_feature
+    other_features = [col for col in numeric_cols if col != selected_feature]
+    scatter_y = other_features[0] if other_features else selected_feature
+    x_values = df[scatter_x].to_numpy()
+    y_values = (df.index if scatter_x == scatter_y else df[scatter_y]).to_numpy()
+    if scatter_x == scatter_y:
+        scatter_y = 'index'
+
+    is_anomaly = np.zeros(len(df), dtype=bool)
+    is_anomaly[_anomaly_rows(data['key'], feature_idx, z_score_threshold, z_matrix)] = True
+    rows = _scatter_point_indices(x_values, y_values, is_anomaly)
+
+    return {
+        # Arrays are left as numpy so orjson writes float32 values in their
+        # shortest form (0.1, not 0.10000000149011612).
+        'x':       x_values[rows],
+        'y':       y_values[rows],
+        'z':       z_scores[rows],
+        'flags':   is_anomaly[rows].astype(np.uint8),
+        'x_name':  scatter_x,
+        'y_name':  scatter_y,
+        'colors':  LABEL_COLORS,
+        'layout':  {
+            **DARK_LAYOUT.to_plotly_json(),
+            'title':         {'text': (
+                f'Anomaly Detection: {pretty_names[scatter_x]}'
+                f' vs {pretty_names.get(scatter_y, "Index")}'
+            )},
+            'xaxis':         {'title': {'text': scatter_x}},
+            'yaxis':         {'title': {'text': scatter_y}},
+            'legend':        {'title': {'text': 'anomaly_label'}},
+            'uirevision':    selected_feature,
+        },
+    }
+
+
+app.clientside_callback(
+    ClientsideFunction(namespace='anomaly', function_name='scatterFigure'),
+    Output('anomaly-scatter-plot', 'figure'),
+    Input('zscore-store', 'data'),
+)
+
+
+# Server callbacks read the debounced threshold, so a burst of slider
+# changes (arrow-key steps, quick clicks along the track) triggers one
+# recompute when it settles rather than one per value.
+app.clientside_callback(
+    ClientsideFunction(namespace='anomaly', function_name='debounceThreshold'),
+    Output('z-score-threshold-debounced', 'data'),
+    Input('z-score-threshold-slider', 'value'),
+    prevent_initial_call=True,
+)
+
+
 # ──────────────────────────────────────────────
 # Anomaly detection
 # ──────────────────────────────────────────────
 @app.callback(
     [
-        Output('anomaly-scatter-plot',   'figure'),
         Output('histogram-plots-row',    'children'),
-        Output('anomaly-table',          'data'),
         Output('anomaly-table',          'columns'),
         Output('total-anomalies-kpi',    'children'),
         Output('anomalous-data-store',   'data'),
     ],
     [
-        Input('stored-data',              'data'),
-        Input('numeric-cols',             'data'),
-        Input('feature-dropdown',         'value'),
-        Input('z-score-threshold-slider', 'value'),
+        Input('stored-data',                 'data'),
+        Input('numeric-cols',                'data'),
+        Input('feature-dropdown',            'value'),
+        Input('z-score-threshold-debounced', 'data'),
     ],
+    State('pretty-names', 'data'),
 )
-def update_analysis(data, numeric_cols, selected_feature, z_score_threshold):
-    placeholder = _empty_fig()
+def update_analysis(data, numeric_cols, selected_feature, z_score_threshold, pretty_names):
+    df, z_matrix = _load_analysis_inputs(data, numeric_cols, selected_feature)
+    if df is None:
+        return [], [], "0", None
 
-    if data is None or selected_feature is None or numeric_cols is None:
-        return placeholder, [], [], [], "0", None
+    feature_idx = numeric_cols.index(selected_feature)
+    is_anomaly = np.zeros(len(df), dtype=bool)
+    is_anomaly[_anomaly_rows(data['key'], feature_idx, z_score_threshold, z_matrix)] = True
 
-    df = pd.DataFrame(data)
-
-    if selected_feature not in df.columns or df[selected_feature].dtype not in ['int64', 'float64']:
-        return placeholder, [], [], [], "0", None
-
-    df['z_score'] = zscore(df[selected_feature].dropna())
-    df['anomaly_label'] = df['z_score'].apply(
-        lambda x: 'Abnormal' if abs(x) > z_score_threshold else 'Normal'
-    )
-
-    scatter_x = selected_feature
-    other_features = [col for col in numeric_cols if col != selected_feature]
-    scatter_y = other_features[0] if other_features else selected_feature
-    if scatter_x == scatter_y:
-        df['index'] = df.index
-        scatter_y = 'index'
-
-    scatter_fig = px.scatter(
-        df,
-        x=scatter_x,
-        y=scatter_y,
-        color='anomaly_label',
-        title=(
-            f'Anomaly Detection: {scatter_x.replace("_", " ").title()}'
-            f' vs {scatter_y.replace("_", " ").title()}'
-        ),
-        color_discrete_map={'Normal': '#90ee90', 'Abnormal': styles['danger']},
-        hover_data=[scatter_x, scatter_y, 'z_score'],
-    )
-    scatter_fig.update_layout(
-        plot_bgcolor=styles['card_bg'],
-        paper_bgcolor=styles['card_bg'],
-        font={'color': styles['text']},
-        height=GRAPH_HEIGHT,
-        margin=dict(l=20, r=20, t=50, b=20),
-    )
+    # Only the distributions most related to the selected feature are built,
+    # in the order ranked once per upload by _parse_upload.
+    ranking = cache.get(f"{data['key']}:rank")
+    if ranking is None:
+        return [], [], "0", None
 
     histogram_plots = []
-    for col in numeric_cols:
-        hist_fig = px.histogram(
-            df,
-            x=col,
-            color='anomaly_label',
-            title=f'Distribution of {col.replace("_", " ").title()}',
-            color_discrete_map={'Normal': '#90ee90', 'Abnormal': styles['danger']},
-        )
-        hist_fig.update_layout(
-            plot_bgcolor=styles['card_bg'],
-            paper_bgcolor=styles['card_bg'],
-            font={'color': styles['text']},
-            height=GRAPH_HEIGHT,
-            margin=dict(l=20, r=20, t=50, b=20),
+    for col in (numeric_cols[i] for i in ranking[feature_idx]):
+        values = df[col].to_numpy()
+        # Static overview charts: no hover labels or drag interactions to build.
+        hist_traces = [
+            go.Histogram(
+                x=values[rows], name=label, marker_color=LABEL_COLORS[label],
+                nbinsx=HISTOGRAM_BINS, bingroup='x', hoverinfo='skip',
+            )
+            for label, rows in (('Normal', ~is_anomaly), ('Abnormal', is_anomaly))
+        ]
+        hist_fig = go.Figure(
+            data=hist_traces,
+            layout=DARK_LAYOUT,
+            layout_title_text=f'Distribution of {pretty_names[col]}',
+            layout_xaxis_title_text=col,
+            layout_yaxis_title_text='count',
+            layout_legend_title_text='anomaly_label',
+            layout_barmode='relative',
+            layout_dragmode=False,
         )
         histogram_plots.append(
             dbc.Col(
                 dbc.Card(dbc.CardBody([
                     html.H5(
-                        f'{col.replace("_", " ").title()} Distribution',
+                        f'{pretty_names[col]} Distribution',
                         className="card-title",
                     ),
                     dcc.Graph(
                         figure=hist_fig,
-                        config={'displayModeBar': False},
+                        config={'displayModeBar': False, 'responsive': True},
                         style={'height': f'{GRAPH_HEIGHT}px'},
                     ),
                 ])),
@@ -488,26 +704,82 @@ def update_analysis(data, numeric_cols, selected_feature, z_score_threshold):
             )
         )
 
-    anomalous_points = df[df['anomaly_label'] == 'Abnormal'].copy()
-    anomalous_points['index'] = anomalous_points.index
-    anomalous_points['z_score'] = anomalous_points['z_score'].round(2)
-
-    table_cols = [
-        {'name': i.replace('_', ' ').title(), 'id': i}
-        for i in ['index'] + numeric_cols + ['z_score']
-    ]
-    anomalous_data_json = anomalous_points.to_json(date_format='iso', orient='split')
+    # The table itself is filled page by page in update_anomaly_table_page.
+    table_cols = (
+        [{'name': 'Index', 'id': 'index'}]
+        + [{'name': pretty_names[col], 'id': col} for col in numeric_cols]
+        + [{'name': 'Z Score', 'id': 'z_score'}]
+    )
+    anomaly_count = int(np.count_nonzero(is_anomaly))
 
+    # The store only describes the anomalous rows; generate_report rebuilds
+    # them from the cached frame and z-scores when a download is clicked.
     return (
-        scatter_fig,
         histogram_plots,
-        anomalous_points.to_dict('records'),
         table_cols,
-        str(len(anomalous_points)),
-        anomalous_data_json,
+        str(anomaly_count),
+        {
+            'key':       data['key'],
+            'feature':   selected_feature,
+            'threshold': z_score_threshold,
+            'rows':      anomaly_count,
+        },
+    )
+
+
+def _with_table_fields(frame):
+    """Add the 'index' and rounded 'z_score' columns shown in the anomaly table."""
+    return frame.assign(
+        index=frame.index,
+        z_score=frame['z_score'].astype(np.float64).round(2),
     )
 
 
+# ──────────────────────────────────────────────
+# Anomaly table
+# Server-side paging: only the visible page is
+# converted to records and sent to the browser.
+# ──────────────────────────────────────────────
+@app.callback(
+    [
+        Output('anomaly-table', 'data'),
+        Output('anomaly-table', 'page_count'),
+        Output('anomaly-table', 'page_current'),
+    ],
+    [
+        Input('anomaly-table',               'page_current'),
+        Input('stored-data',                 'data'),
+        Input('numeric-cols',                'data'),
+        Input('feature-dropdown',            'value'),
+        Input('z-score-threshold-debounced', 'data'),
+    ],
+    State('anomaly-table', 'page_size'),
+)
+def update_anomaly_table_page(page_current, data, numeric_cols, selected_feature, z_score_threshold, page_size):
+    df, z_matrix = _load_analysis_inputs(data, numeric_cols, selected_feature)
+    if df is None:
+        return [], 0, 0
+
+    # A new upload, feature or threshold starts again from the first page.
+    if ctx.triggered_id != 'anomaly-table':
+        page_current = 0
+
+    feature_idx = numeric_cols.index(selected_feature)
+    z_scores = z_matrix[:, feature_idx]
+    anomaly_rows = _anomaly_rows(data['key'], feature_idx, z_score_threshold, z_matrix)
+    page_rows = anomaly_rows[page_current * page_size:(page_current + 1) * page_size]
+
+    page = df.iloc[page_rows].assign(z_score=z_scores[page_rows])
+    page = _with_table_fields(page)[['index'] + numeric_cols + ['z_score']]
+
+    # to_dict widens float32 to float64 digits; go through the float32 repr
+    # so the table shows the values as uploaded.
+    float32_cols = page.select_dtypes(np.float32).columns
+    page[float32_cols] = page[float32_cols].astype(str).astype(np.float64)
+
+    return page.to_dict('records'), -(-len(anomaly_rows) // page_size), page_current
+
+
 # ──────────────────────────────────────────────
 # Legacy CSV download  (sidebar "Reports" link)
 # ──────────────────────────────────────────────
@@ -515,12 +787,24 @@ def update_analysis(data, numeric_cols, selected_feature, z_score_threshold):
     Output("download-report-trigger", "data"),
     Input("download-report-link", "n_clicks"),
     State('anomalous-data-store', 'data'),
+    State('numeric-cols',         'data'),
     prevent_initial_call=True,
 )
-def generate_report(n_clicks, anomalous_data_json):
-    if n_clicks and anomalous_data_json:
-        df = pd.read_json(anomalous_data_json, orient='split')
-        return dcc.send_data_frame(df.to_csv, "anomaly_report.csv")
+def generate_report(n_clicks, anomalous_data, numeric_cols):
+    if n_clicks and anomalous_data:
+        df, z_matrix = _load_analysis_inputs(
+            {'key': anomalous_data['key']}, numeric_cols, anomalous_data['feature'],
+        )
+        if df is not None:
+            feature_idx = numeric_cols.index(anomalous_data['feature'])
+            rows = _anomaly_rows(anomalous_data['key'], feature_idx, anomalous_data['threshold'], z_matrix)
+            anomalous_points = _with_table_fields(
+                df.iloc[rows].assign(z_score=z_matrix[rows, feature_idx])
+            ).assign(anomaly_label='Abnormal')
+            # Arrow's CSV writer streams straight into the response buffer
+            # (GIL released) instead of building the whole CSV string first.
+            table = pa.Table.from_pandas(anomalous_points, preserve_index=False)
+            return dcc.send_bytes(lambda buf: pacsv.write_csv(table, buf), "anomaly_report.csv")
     return None
 
 
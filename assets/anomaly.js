@@ -0,0 +1,86 @@
+// ──────────────────────────────────────────────
+// Clientside callbacks for the anomaly dashboard.
+// Dash serves every file in assets/ automatically;
+// functions are registered in app.py through
+// ClientsideFunction(namespace='anomaly', ...).
+// ──────────────────────────────────────────────
+const THRESHOLD_DEBOUNCE_MS = 150;
+let pendingThreshold = null;
+
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    anomaly: {
+        // Trailing debounce for the z-score slider (slider -> debounced store).
+        // A superseded value resolves with no_update so it never reaches the server.
+        debounceThreshold: function (value) {
+            if (pendingThreshold) {
+                clearTimeout(pendingThreshold.timer);
+                pendingThreshold.resolve(window.dash_clientside.no_update);
+            }
+            return new Promise(function (resolve) {
+                pendingThreshold = {
+                    resolve: resolve,
+                    timer: setTimeout(function () {
+                        pendingThreshold = null;
+                        resolve(value);
+                    }, THRESHOLD_DEBOUNCE_MS),
+                };
+            });
+        },
+
+        // Highlight the clicked attack card (card n_clicks -> card styles).
+        // Cards use {type: 'attack-card', idx} ids, laid out in idx order.
+        selectAttackCard: function (nClicks, cardStyles) {
+            const clicked = window.dash_clientside.callback_context.triggered_id;
+            return nClicks.map(function (_, idx) {
+                return clicked && clicked.idx === idx ? cardStyles.selected : cardStyles.unselected;
+            });
+        },
+
+        // Build the Normal vs. Abnormal scatter figure from the points and
+        // flags picked on the server (zscore-store -> figure).
+        // WebGL traces keep large uploads responsive; SVG stalls past ~15k points.
+        scatterFigure: function (zdata) {
+            if (!zdata) {
+                return window.dash_clientside.no_update;
+            }
+            if (zdata.placeholder) {
+                return zdata.placeholder;
+            }
+
+            const colors = zdata.colors;
+            const points = {
+                type: 'scattergl',
+                mode: 'markers',
+                x: zdata.x,
+                y: zdata.y,
+                customdata: zdata.z,
+                marker: {
+                    color: zdata.flags,
+                    cmin: 0,
+                    cmax: 1,
+                    colorscale: [[0, colors.Normal], [1, colors.Abnormal]],
+                },
+                showlegend: false,
+                hovertemplate: (
+                    zdata.x_name + '=%{x}<br>' +
+                    zdata.y_name + '=%{y}<br>' +
+                    'z_score=%{customdata:.2f}<extra></extra>'
+                ),
+            };
+            // One point per label so the legend still shows both colours.
+            const legend = Object.keys(colors).map(function (label) {
+                return {
+                    type: 'scattergl',
+                    mode: 'markers',
+                    name: label,
+                    x: [null],
+                    y: [null],
+                    marker: {color: colors[label]},
+                    hoverinfo: 'skip',
+                };
+            });
+
+            return {data: [points].concat(legend), layout: zdata.layout};
+        },
+    },
+});
@@ -0,0 +1,20 @@
+import os
+import tempfile
+
+from flask_caching import Cache
+
+# ──────────────────────────────────────────────
+# Server-side cache
+# Uploaded DataFrames live here instead of in a
+# dcc.Store, so callbacks only pass a small key
+# through the browser. Bound to the Flask server
+# in app.py via cache.init_app().
+# ──────────────────────────────────────────────
+CACHE_CONFIG = {
+    'CACHE_TYPE':            'FileSystemCache',
+    'CACHE_DIR':             os.path.join(tempfile.gettempdir(), 'anomaly-detector-cache'),
+    'CACHE_DEFAULT_TIMEOUT': 3600,
+    'CACHE_THRESHOLD':       64,
+}
+
+cache = Cache()
@@ -1,12 +1,15 @@
 import dash
-from dash import dcc, html, dash_table, callback, Input, Output, State, no_update
+from dash import dcc, html, dash_table, callback, clientside_callback, ClientsideFunction, Input, Output, State, Patch, ALL, no_update
 import dash_bootstrap_components as dbc
 import plotly.graph_objects as go
-import plotly.express as px
 from datetime import datetime
-import pandas as pd
+from functools import lru_cache
+from string import Template
+from pathlib import Path
+from flask import request
 import numpy as np
-import json
+import orjson
+from kernels import compute_report
 
 styles = {
     'background': '#1a1a2e',
@@ -31,32 +34,41 @@ styles = {
 # ─────────────────────────────────────────────
 GRAPH_HEIGHT = 380   # single source of truth for all graph heights
 TABLE_HEIGHT = 360   # single source of truth for all table heights
+Z_THRESHOLD_MIN = 1  # lowest value the z-score slider allows
+Z_THRESHOLD_DEFAULT = 3
+ANOMALY_PAGE_SIZE = 25  # rows per server-side page of the anomaly table
 
+@lru_cache(maxsize=8)
 def _empty_fig(label="Upload a CSV file to get started"):
-    """Return a consistently-styled empty placeholder figure."""
-    fig = go.Figure()
-    fig.add_annotation(
-        text=label,
-        xref="paper", yref="paper",
-        x=0.5, y=0.5,
-        showarrow=False,
-        font=dict(size=15, color=styles['text'], family="Arial"),
-        bgcolor="rgba(42,42,74,0.8)",
-        bordercolor=styles['card_border'],
-        borderwidth=2,
-        borderpad=16,
-    )
-    fig.update_layout(
-        plot_bgcolor=styles['card_bg'],
-        paper_bgcolor=styles['card_bg'],
-        font_color=styles['text'],
-        height=GRAPH_HEIGHT,
-        showlegend=False,
-        margin=dict(l=20, r=20, t=40, b=20),
-        xaxis=dict(visible=False),
-        yaxis=dict(visible=False),
-    )
-    return fig
+    """Return a consistently-styled empty placeholder figure as a plotly dict.
+
+    Built as a literal dict (no go.Figure validation) and cached per label, so
+    the result is shared: wrap it in go.Figure() before modifying it.
+    """
+    return {
+        'data': [],
+        'layout': {
+            'annotations': [{
+                'text': label,
+                'xref': 'paper', 'yref': 'paper',
+                'x': 0.5, 'y': 0.5,
+                'showarrow': False,
+                'font': {'size': 15, 'color': styles['text'], 'family': 'Arial'},
+                'bgcolor': 'rgba(42,42,74,0.8)',
+                'bordercolor': styles['card_border'],
+                'borderwidth': 2,
+                'borderpad': 16,
+            }],
+            'plot_bgcolor': styles['card_bg'],
+            'paper_bgcolor': styles['card_bg'],
+            'font': {'color': styles['text']},
+            'height': GRAPH_HEIGHT,
+            'showlegend': False,
+            'margin': {'l': 20, 'r': 20, 't': 40, 'b': 20},
+            'xaxis': {'visible': False},
+            'yaxis': {'visible': False},
+        },
+    }
 
 
 def get_empty_figure():
@@ -64,33 +76,229 @@ def get_empty_figure():
     return _empty_fig("No anomaly data available – upload a CSV to generate a security report")
 
 
-def classify_risk(count, total_anomalies):
-    if total_anomalies == 0:
-        return "Low"
-    ratio = count / total_anomalies
-    if ratio > 0.5:
-        return "High"
-    elif ratio > 0.2:
-        return "Medium"
-    return "Low"
+# Placeholders used by the layout and the report callback, built once.
+_EMPTY_FIG_DEFAULT = _empty_fig()
+_EMPTY_FIG_REPORT = _empty_fig("No anomaly data – upload a CSV to generate report")
+
+# Dark theme applied to the attack-trend bar chart.
+_BASE_LAYOUT = dict(
+    plot_bgcolor=styles['card_bg'],
+    paper_bgcolor=styles['card_bg'],
+    font_color=styles['text'],
+    height=GRAPH_HEIGHT,
+    showlegend=False,
+    title_font_size=16,
+    xaxis_title="Attack Type",
+    yaxis_title="Incident Count",
+    margin=dict(l=20, r=20, t=50, b=20),
+)
+
+_BAR_COLORSCALE = [[0, '#00bfa5'], [0.5, '#ffc400'], [1, '#ff006e']]
+
+
+@lru_cache(maxsize=64)
+def _bar_figure(bars):
+    """Attack-trend bar chart for a tuple of (attack_type, count) pairs, as a plotly dict.
+
+    Cached, so identical reports skip figure construction and validation;
+    the dict is shared and must not be modified.
+    """
+    attack_types, counts = zip(*bars)
+    fig = go.Figure(
+        go.Bar(
+            x=attack_types, y=counts,
+            marker=dict(
+                color=counts, colorscale=_BAR_COLORSCALE,
+                showscale=True, colorbar=dict(title=dict(text='count')),
+            ),
+            hovertemplate='attack_type=%{x}<br>count=%{y}<extra></extra>',
+        ),
+    )
+    fig.update_layout(title_text="Current Attack Distribution", **_BASE_LAYOUT)
+    return fig.to_dict()
+
+
+HIGH_RISK_RATIO = 0.5     # share of all anomalies above which an attack is High risk
+MEDIUM_RISK_RATIO = 0.2   # ... and Medium risk
+
+
+# Risk codes returned by kernels.compute_report, indexed into labels.
+_RISK_LEVELS = np.array(["Low", "Medium", "High"])
+
+
+def _argmax_count(rows):
+    """Row with the largest 'count' (first one on ties), in a single pass."""
+    best = rows[0]
+    best_count = best['count']
+    for row in rows:
+        if row['count'] > best_count:
+            best, best_count = row, row['count']
+    return best
 
 
 # NOTE: All CSS and JS is now in app.index_string (app.py).
 # html.Style and html.Script are not valid Dash components.
 
 
+# ─────────────────────────────────────────────
+# Layout styles
+# Built once at import; the layout references
+# these instead of allocating literals per call.
+# ─────────────────────────────────────────────
+_STYLE_WRAPPER = {
+    'backgroundColor': styles['background'],
+    'minHeight': '100vh',
+    'fontFamily': 'sans-serif',
+    'color': styles['text'],
+}
+_STYLE_BRAND = {
+    'color': styles['secondary'],
+    'fontSize': '1.5rem',
+    'fontWeight': 'bold',
+    'margin': '0 0 12px 0',
+    'textAlign': 'center',
+}
+_STYLE_NAV_DASHBOARD = {'color': styles['sidebar_text'], 'fontWeight': 'bold',
+                        'fontSize': '1rem', 'padding': '4px 0'}
+_STYLE_NAV_REPORTS = {'color': styles['sidebar_text'], 'opacity': 0.8,
+                      'fontSize': '1rem', 'textDecoration': 'none', 'padding': '4px 0'}
+_STYLE_SIDEBAR_RULE = {'borderColor': '#444', 'margin': '12px 0'}
+_STYLE_SIDEBAR_LABEL = {'color': styles['sidebar_text'], 'marginBottom': '4px', 'fontSize': '0.9rem'}
+_ZSCORE_MARKS = {
+    i: {'label': str(i), 'style': {'color': styles['sidebar_text'], 'fontSize': '0.8rem'}}
+    for i in range(1, 6)
+}
+_STYLE_DROPDOWN = {'color': styles['text'], 'backgroundColor': styles['card_bg'],
+                   'border': 'none', 'fontSize': '0.9rem'}
+_STYLE_UPLOAD_BUTTON = {'width': '100%', 'fontSize': '0.9rem'}
+
+_STYLE_HEADER_TITLE = {'color': styles['text'], 'fontWeight': 'bold'}
+_STYLE_HEADER_BUTTONS = {'textAlign': 'right', 'display': 'flex',
+                         'flexWrap': 'wrap', 'justifyContent': 'flex-end', 'gap': '6px'}
+_STYLE_HEADER_ROW = {
+    'backgroundColor': styles['card_bg'],
+    'padding': '14px 18px',
+    'borderRadius': '10px',
+    'boxShadow': '0 5px 20px rgba(0,0,0,0.3)',
+}
+_STYLE_UPLOAD_STATUS = {
+    'minHeight': '48px',
+    'display': 'flex',
+    'alignItems': 'center',
+    'justifyContent': 'center',
+    'color': styles['secondary'],
+    'padding': '8px 0',
+}
+_STYLE_CENTER = {'textAlign': 'center'}
+
+_STYLE_SECTION_TITLE = {'color': styles['secondary'], 'fontWeight': 'bold', 'margin': 0}
+_STYLE_ATTACK_HEADER = {'backgroundColor': styles['primary'],
+                        'borderBottom': f'3px solid {styles["secondary"]}'}
+_STYLE_REPORT_HEADER = {'backgroundColor': styles['primary'],
+                        'borderBottom': f'3px solid {styles["danger"]}'}
+_STYLE_SUBCARD_HEADER = {'backgroundColor': styles['card_bg'], 'color': styles['text']}
+
+_STYLE_HIGHEST_TITLE = {'color': styles['warning'], 'fontWeight': 'bold', 'marginBottom': '12px'}
+_STYLE_HIGHEST_NAME = {'color': styles['text'], 'minHeight': '42px'}
+_STYLE_HIGHEST_COUNT = {'color': styles['danger'], 'fontWeight': 'bold', 'minHeight': '36px'}
+_STYLE_HIGHEST_PROB = {'color': styles['success'], 'fontSize': '1.2rem',
+                       'fontWeight': 'bold', 'minHeight': '28px'}
+_STYLE_RISK_PLACEHOLDER = {'color': styles['text']}
+_STYLE_RISK_BADGE_SLOT = {'minHeight': '48px'}
+_STYLE_DOWNLOAD_BUTTON = {'fontWeight': 'bold', 'fontSize': '1.05rem'}
+_STYLE_TIMESTAMP = {'textAlign': 'center', 'minHeight': '20px'}
+_STYLE_GRAPH = {'height': f'{GRAPH_HEIGHT}px'}
+_STYLE_GRAPH_BODY = {'padding': '8px'}
+_STYLE_ATTACK_CARD = {'boxShadow': '0 12px 40px rgba(0,0,0,0.4)'}
+_STYLE_REPORT_CARD = {'boxShadow': '0 20px 50px rgba(255,0,110,0.2)'}
+_STYLE_PLOTS = {'display': 'block'}
+_STYLE_TABLE = {'overflowX': 'auto', 'height': f'{TABLE_HEIGHT}px', 'overflowY': 'auto'}
+
+_STYLE_SUMMARY_CELL = {
+    'textAlign': 'left',
+    'padding': '12px',
+    'border': f'1px solid {styles["card_border"]}',
+    'whiteSpace': 'normal',
+}
+_STYLE_SUMMARY_HEADER = {
+    **_STYLE_SUMMARY_CELL,
+    'backgroundColor': styles['primary'],
+    'color': 'white',
+    'fontWeight': 'bold',
+    'fontSize': '14px',
+}
+# Summary rows are coloured by risk level; one cell style per level.
+_RISK_BG = {
+    level: {**_STYLE_SUMMARY_CELL, 'backgroundColor': styles[bg], 'color': fg,
+            'fontWeight': 'bold', 'fontSize': '13px'}
+    for level, bg, fg in (('High', 'high_risk', 'white'),
+                          ('Medium', 'medium_risk', 'black'),
+                          ('Low', 'low_risk', 'white'))
+}
+_SUMMARY_COLUMNS = ("Attack Type", "Total Count", "Probability %", "Risk Level")
+
+# Highest-risk badges: only three are possible, so all are built up front.
+_RISK_ICONS = {'High': '🔴', 'Medium': '🟡', 'Low': '🟢'}
+_RISK_COLORS = {'High': styles['high_risk'], 'Medium': styles['medium_risk'], 'Low': styles['low_risk']}
+_STYLE_RISK_ICON = {'fontSize': '1.6rem', 'marginRight': '6px'}
+_STYLE_RISK_BADGE = {'textAlign': 'center', 'padding': '8px'}
+_RISK_BADGES = {
+    level: html.Div([
+        html.Span(f"{_RISK_ICONS[level]} ", style=_STYLE_RISK_ICON),
+        html.Span(
+            f"{level} RISK",
+            style={
+                'backgroundColor': color,
+                'color': 'black' if level == 'Medium' else 'white',
+                'padding': '8px 18px',
+                'borderRadius': '20px',
+                'fontWeight': 'bold',
+                'fontSize': '1rem',
+            },
+        ),
+    ], style=_STYLE_RISK_BADGE)
+    for level, color in _RISK_COLORS.items()
+}
+_NO_THREAT_BADGE = html.Div(
+    "🟢 LOW RISK",
+    style={'color': styles['low_risk'], 'fontSize': '1.1rem', 'fontWeight': 'bold'},
+)
+_PLACEHOLDER_BADGE = html.Div("—", style=_STYLE_RISK_PLACEHOLDER)
+
+_STYLE_ANOMALY_HEADER = {'backgroundColor': styles['card_bg'], 'color': styles['text'], 'fontWeight': 'bold'}
+_STYLE_ANOMALY_DATA = {'backgroundColor': styles['card_bg'], 'color': styles['text']}
+_STYLE_ANOMALY_CELL = {
+    'textAlign': 'left',
+    'padding': '10px',
+    'borderBottom': f'1px solid {styles["card_border"]}',
+    'whiteSpace': 'normal',
+    'height': 'auto',
+}
+
+
+def _summary_table(report_data):
+    """Static attack summary table (at most six rows, so no DataTable needed)."""
+    header = html.Thead(html.Tr([html.Th(name, style=_STYLE_SUMMARY_HEADER) for name in _SUMMARY_COLUMNS]))
+    rows = [
+        html.Tr([
+            html.Td(row[field], style=_RISK_BG[row['risk_level']])
+            for field in ('attack_type', 'count', 'probability', 'risk_level')
+        ])
+        for row in report_data
+    ]
+    return dbc.Table([header, html.Tbody(rows)], bordered=True, className="mb-0")
+
+
+_EMPTY_SUMMARY_TABLE = _summary_table([])
+
+
 # ─────────────────────────────────────────────
 # Dashboard layout
 # ─────────────────────────────────────────────
 def get_dashboard_layout():
     return html.Div(
         id="dashboard-wrapper",
-        style={
-            'backgroundColor': styles['background'],
-            'minHeight': '100vh',
-            'fontFamily': 'sans-serif',
-            'color': styles['text'],
-        },
+        style=_STYLE_WRAPPER,
         children=[
 
             # ── Sidebar ───────────────────────────────────
@@ -102,16 +310,7 @@ def get_dashboard_layout():
 
                     # Brand
                     html.Div(id="sidebar-brand", children=[
-                        html.H2(
-                            "Anomaly Detector",
-                            style={
-                                'color': styles['secondary'],
-                                'fontSize': '1.5rem',
-                                'fontWeight': 'bold',
-                                'margin': '0 0 12px 0',
-                                'textAlign': 'center',
-                            }
-                        ),
+                        html.H2("Anomaly Detector", style=_STYLE_BRAND),
                     ]),
 
                     # Nav links
@@ -119,18 +318,16 @@ def get_dashboard_layout():
                         dbc.NavLink(
                             "📊 Dashboard", href="/", active="exact",
                             className="nav-link",
-                            style={'color': styles['sidebar_text'], 'fontWeight': 'bold',
-                                   'fontSize': '1rem', 'padding': '4px 0'},
+                            style=_STYLE_NAV_DASHBOARD,
                         ),
                         html.A(
                             "📥 Reports", id="download-report-link", href="#",
                             className="nav-link",
-                            style={'color': styles['sidebar_text'], 'opacity': 0.8,
-                                   'fontSize': '1rem', 'textDecoration': 'none', 'padding': '4px 0'},
+                            style=_STYLE_NAV_REPORTS,
                         ),
                     ]),
 
-                    html.Hr(style={'borderColor': '#444', 'margin': '12px 0'}),
+                    html.Hr(style=_STYLE_SIDEBAR_RULE),
 
                     # All controls in a wrappable row on mobile
                     html.Div(
@@ -139,44 +336,39 @@ def get_dashboard_layout():
 
                             # Feature dropdown
                             html.Div(id="sidebar-feature", children=[
-                                html.P("Select Feature:",
-                                       style={'color': styles['sidebar_text'],
-                                              'marginBottom': '4px', 'fontSize': '0.9rem'}),
+                                html.P("Select Feature:", style=_STYLE_SIDEBAR_LABEL),
                                 dcc.Dropdown(
                                     id='feature-dropdown',
                                     placeholder="Select a feature…",
-                                    style={'color': styles['text'],
-                                           'backgroundColor': styles['card_bg'],
-                                           'border': 'none', 'fontSize': '0.9rem'},
+                                    style=_STYLE_DROPDOWN,
                                 ),
                             ]),
 
                             # Z-score slider
                             html.Div(id="sidebar-slider", children=[
-                                html.P("Z-Score Threshold:",
-                                       style={'color': styles['sidebar_text'],
-                                              'marginBottom': '4px', 'fontSize': '0.9rem'}),
+                                html.P("Z-Score Threshold:", style=_STYLE_SIDEBAR_LABEL),
                                 dcc.Slider(
                                     id='z-score-threshold-slider',
-                                    min=1, max=5, step=0.1, value=3,
-                                    marks={i: {'label': str(i),
-                                               'style': {'color': styles['sidebar_text'],
-                                                         'fontSize': '0.8rem'}}
-                                           for i in range(1, 6)},
+                                    min=Z_THRESHOLD_MIN, max=5, step=0.1, value=Z_THRESHOLD_DEFAULT,
+                                    marks=_ZSCORE_MARKS,
                                     tooltip={"placement": "bottom", "always_visible": True},
+                                    # dcc.Slider's default, spelled out: the value (and so
+                                    # every graph, the scatter included) only updates when
+                                    # the handle is released, never while dragging.
+                                    updatemode='mouseup',
                                 ),
+                                # Trailing-debounced copy of the slider value that the
+                                # server-side analysis callbacks listen to.
+                                dcc.Store(id='z-score-threshold-debounced', data=Z_THRESHOLD_DEFAULT),
                             ]),
 
                             # Upload
                             html.Div(id="sidebar-upload", children=[
-                                html.P("Upload CSV:",
-                                       style={'color': styles['sidebar_text'],
-                                              'marginBottom': '4px', 'fontSize': '0.9rem'}),
+                                html.P("Upload CSV:", style=_STYLE_SIDEBAR_LABEL),
                                 dcc.Upload(
                                     id='upload-data',
                                     children=html.Div([
-                                        dbc.Button('📂 Upload File', color="info",
-                                                   style={'width': '100%', 'fontSize': '0.9rem'}),
+                                        dbc.Button('📂 Upload File', color="info", style=_STYLE_UPLOAD_BUTTON),
                                     ]),
                                     multiple=False,
                                 ),
@@ -196,10 +388,7 @@ def get_dashboard_layout():
                     dbc.Row(
                         [
                             dbc.Col(
-                                html.H4(
-                                    "Anomaly Detection Dashboard",
-                                    style={'color': styles['text'], 'fontWeight': 'bold'},
-                                ),
+                                html.H4("Anomaly Detection Dashboard", style=_STYLE_HEADER_TITLE),
                                 xs=12, md=6,
                             ),
                             dbc.Col(
@@ -213,20 +402,14 @@ def get_dashboard_layout():
                                         dbc.Button("🚪 Logout", id="logout-btn", href="/logout", color="danger", className="ms-2")
                                     ],
                                     id="header-buttons",
-                                    style={'textAlign': 'right', 'display': 'flex',
-                                           'flexWrap': 'wrap', 'justifyContent': 'flex-end', 'gap': '6px'},
+                                    style=_STYLE_HEADER_BUTTONS,
                                 ),
                                 xs=12, md=6,
                             ),
                         ],
                         align="center",
                         className="mb-4",
-                        style={
-                            'backgroundColor': styles['card_bg'],
-                            'padding': '14px 18px',
-                            'borderRadius': '10px',
-                            'boxShadow': '0 5px 20px rgba(0,0,0,0.3)',
-                        },
+                        style=_STYLE_HEADER_ROW,
                     ),
 
                     # ── KPI cards ─────────────────────────
@@ -264,17 +447,10 @@ def get_dashboard_layout():
                     # Always visible, height-fixed so it doesn't push content
                     html.Div(
                         id='output-data-upload',
-                        style={
-                            'minHeight': '48px',
-                            'display': 'flex',
-                            'alignItems': 'center',
-                            'justifyContent': 'center',
-                            'color': styles['secondary'],
-                            'padding': '8px 0',
-                        },
+                        style=_STYLE_UPLOAD_STATUS,
                         children=html.Span(
                             "Please upload a CSV file to get started.",
-                            style={'textAlign': 'center'},
+                            style=_STYLE_CENTER,
                         ),
                     ),
 
@@ -282,32 +458,29 @@ def get_dashboard_layout():
                     dbc.Card(
                         [
                             dbc.CardHeader(
-                                html.H5("🎯 Attack Types",
-                                        style={'color': styles['secondary'], 'fontWeight': 'bold', 'margin': 0}),
-                                style={'backgroundColor': styles['primary'],
-                                       'borderBottom': f'3px solid {styles["secondary"]}'},
+                                html.H5("🎯 Attack Types", style=_STYLE_SECTION_TITLE),
+                                style=_STYLE_ATTACK_HEADER,
                             ),
                             dbc.CardBody([
                                 dcc.Store(id='selected-attack', data=None),
+                                dcc.Store(id='attack-card-styles', data=_ATTACK_CARD_STYLES),
                                 dbc.Row(
                                     id='attack-types-grid',
                                     className="g-2",
-                                    children=_build_attack_cards(selected_idx=-1),
+                                    children=_DEFAULT_ATTACK_CARDS,
                                 ),
                             ]),
                         ],
                         className="mb-4",
-                        style={'boxShadow': '0 12px 40px rgba(0,0,0,0.4)'},
+                        style=_STYLE_ATTACK_CARD,
                     ),
 
                     # ── Smart Security Report ──────────────
                     dbc.Card(
                         [
                             dbc.CardHeader(
-                                html.H5("📊 Smart Security Report",
-                                        style={'color': styles['secondary'], 'fontWeight': 'bold', 'margin': 0}),
-                                style={'backgroundColor': styles['primary'],
-                                       'borderBottom': f'3px solid {styles["danger"]}'},
+                                html.H5("📊 Smart Security Report", style=_STYLE_SECTION_TITLE),
+                                style=_STYLE_REPORT_HEADER,
                             ),
                             dbc.CardBody([
                                 dcc.Store(id='smart-report-data', data=None),
@@ -318,25 +491,18 @@ def get_dashboard_layout():
                                     [
                                         dbc.Col(
                                             dbc.Card(dbc.CardBody([
-                                                html.H6("🎯 HIGHEST ATTACK PREDICTION",
-                                                        style={'color': styles['warning'], 'fontWeight': 'bold',
-                                                               'marginBottom': '12px'}),
+                                                html.H6("🎯 HIGHEST ATTACK PREDICTION", style=_STYLE_HIGHEST_TITLE),
                                                 html.H3(id="highest-attack-name", children="—",
-                                                        className="mb-2",
-                                                        style={'color': styles['text'], 'minHeight': '42px'}),
+                                                        className="mb-2", style=_STYLE_HIGHEST_NAME),
                                                 html.H4(id="highest-attack-count", children="0",
-                                                        className="mb-2",
-                                                        style={'color': styles['danger'], 'fontWeight': 'bold',
-                                                               'minHeight': '36px'}),
+                                                        className="mb-2", style=_STYLE_HIGHEST_COUNT),
                                                 html.Div(id="highest-attack-prob", children="0%",
-                                                         style={'color': styles['success'], 'fontSize': '1.2rem',
-                                                                'fontWeight': 'bold', 'minHeight': '28px'}),
+                                                         style=_STYLE_HIGHEST_PROB),
                                                 html.Div(id="highest-risk-badge",
-                                                         children=html.Div("—",
-                                                                           style={'color': styles['text']}),
+                                                         children=_PLACEHOLDER_BADGE,
                                                          className="mt-3",
-                                                         style={'minHeight': '48px'}),
-                                            ], style={'textAlign': 'center'})),
+                                                         style=_STYLE_RISK_BADGE_SLOT),
+                                            ], style=_STYLE_CENTER)),
                                             xs=12, md=8, className="mb-3",
                                         ),
                                         dbc.Col(
@@ -347,13 +513,13 @@ def get_dashboard_layout():
                                                     color="danger",
                                                     size="lg",
                                                     className="w-100",
-                                                    style={'fontWeight': 'bold', 'fontSize': '1.05rem'},
+                                                    style=_STYLE_DOWNLOAD_BUTTON,
                                                 ),
                                                 html.P(
                                                     id="report-timestamp",
                                                     children="No report generated",
                                                     className="mt-3 text-muted small",
-                                                    style={'textAlign': 'center', 'minHeight': '20px'},
+                                                    style=_STYLE_TIMESTAMP,
                                                 ),
                                             ])),
                                             xs=12, md=4, className="mb-3",
@@ -368,19 +534,17 @@ def get_dashboard_layout():
                                         dbc.Card([
                                             dbc.CardHeader(
                                                 "📈 Attack Trend Over Time",
-                                                style={'backgroundColor': styles['card_bg'],
-                                                       'color': styles['text']},
+                                                style=_STYLE_SUBCARD_HEADER,
                                             ),
                                             dbc.CardBody(
                                                 dcc.Graph(
                                                     id='attack-trend-graph',
-                                                    figure=_empty_fig(
-                                                        "No anomaly data – upload a CSV to generate report"),
+                                                    figure=_EMPTY_FIG_REPORT,
                                                     config={'displayModeBar': False},
-                                                    style={'height': f'{GRAPH_HEIGHT}px'},
+                                                    style=_STYLE_GRAPH,
                                                     className="fixed-graph",
                                                 ),
-                                                style={'padding': '8px'},
+                                                style=_STYLE_GRAPH_BODY,
                                             ),
                                         ]),
                                         xs=12,
@@ -394,55 +558,13 @@ def get_dashboard_layout():
                                         dbc.Card([
                                             dbc.CardHeader(
                                                 "📋 Attack Summary Report",
-                                                style={'backgroundColor': styles['card_bg'],
-                                                       'color': styles['text']},
+                                                style=_STYLE_SUBCARD_HEADER,
                                             ),
                                             dbc.CardBody(
-                                                dash_table.DataTable(
+                                                html.Div(
                                                     id='attack-summary-table',
-                                                    columns=[
-                                                        {"name": "Attack Type", "id": "attack_type"},
-                                                        {"name": "Total Count", "id": "count"},
-                                                        {"name": "Probability %", "id": "probability"},
-                                                        {"name": "Risk Level", "id": "risk_level"},
-                                                    ],
-                                                    data=[],
-                                                    style_header={
-                                                        'backgroundColor': styles['primary'],
-                                                        'color': 'white',
-                                                        'fontWeight': 'bold',
-                                                        'fontSize': '14px',
-                                                    },
-                                                    style_data={
-                                                        'backgroundColor': styles['card_bg'],
-                                                        'color': styles['text'],
-                                                        'fontSize': '13px',
-                                                    },
-                                                    style_data_conditional=[
-                                                        {'if': {'filter_query': '{risk_level} = High'},
-                                                         'backgroundColor': styles['high_risk'],
-                                                         'color': 'white', 'fontWeight': 'bold'},
-                                                        {'if': {'filter_query': '{risk_level} = Medium'},
-                                                         'backgroundColor': styles['medium_risk'],
-                                                         'color': 'black', 'fontWeight': 'bold'},
-                                                        {'if': {'filter_query': '{risk_level} = Low'},
-                                                         'backgroundColor': styles['low_risk'],
-                                                         'color': 'white', 'fontWeight': 'bold'},
-                                                    ],
-                                                    style_cell={
-                                                        'textAlign': 'left',
-                                                        'padding': '12px',
-                                                        'border': f'1px solid {styles["card_border"]}',
-                                                        'whiteSpace': 'normal',
-                                                        'height': 'auto',
-                                                    },
-                                                    sort_action="native",
-                                                    page_size=10,
-                                                    style_table={
-                                                        'overflowX': 'auto',
-                                                        'height': f'{TABLE_HEIGHT}px',
-                                                        'overflowY': 'auto',
-                                                    },
+                                                    children=_EMPTY_SUMMARY_TABLE,
+                                                    style=_STYLE_TABLE,
                                                 ),
                                             ),
                                         ]),
@@ -452,7 +574,7 @@ def get_dashboard_layout():
                             ]),
                         ],
                         className="mb-5",
-                        style={'boxShadow': '0 20px 50px rgba(255,0,110,0.2)'},
+                        style=_STYLE_REPORT_CARD,
                     ),
 
                     # ── Analysis plots – ALWAYS rendered, fixed heights ──
@@ -466,9 +588,9 @@ def get_dashboard_layout():
                                         html.H5("Normal vs. Abnormal", className="card-title"),
                                         dcc.Graph(
                                             id='anomaly-scatter-plot',
-                                            figure=_empty_fig(),
+                                            figure=_EMPTY_FIG_DEFAULT,
                                             config={'displayModeBar': False},
-                                            style={'height': f'{GRAPH_HEIGHT}px'},
+                                            style=_STYLE_GRAPH,
                                             className="fixed-graph",
                                         ),
                                     ])),
@@ -478,7 +600,11 @@ def get_dashboard_layout():
                             ),
 
                             # Histogram row – empty until data loads
-                            dbc.Row(id='histogram-plots-row', className="mb-4"),
+                            dcc.Loading(
+                                dbc.Row(id='histogram-plots-row', className="mb-4"),
+                                type='dot',
+                                color=styles['secondary'],
+                            ),
 
                             # Anomaly table
                             dbc.Row(
@@ -489,27 +615,16 @@ def get_dashboard_layout():
                                             id='anomaly-table',
                                             columns=[],
                                             data=[],
-                                            style_header={
-                                                'backgroundColor': styles['card_bg'],
-                                                'color': styles['text'],
-                                                'fontWeight': 'bold',
-                                            },
-                                            style_data={
-                                                'backgroundColor': styles['card_bg'],
-                                                'color': styles['text'],
-                                            },
-                                            style_cell={
-                                                'textAlign': 'left',
-                                                'padding': '10px',
-                                                'borderBottom': f'1px solid {styles["card_border"]}',
-                                                'whiteSpace': 'normal',
-                                                'height': 'auto',
-                                            },
-                                            style_table={
-                                                'overflowX': 'auto',
-                                                'height': f'{TABLE_HEIGHT}px',
-                                                'overflowY': 'auto',
-                                            },
+                                            page_action='custom',
+                                            page_current=0,
+                                            page_size=ANOMALY_PAGE_SIZE,
+                                            page_count=0,
+                                            # Header stays visible while the page body scrolls.
+                                            fixed_rows={'headers': True},
+                                            style_header=_STYLE_ANOMALY_HEADER,
+                                            style_data=_STYLE_ANOMALY_DATA,
+                                            style_cell=_STYLE_ANOMALY_CELL,
+                                            style_table=_STYLE_TABLE,
                                         ),
                                     ])),
                                     xs=12,
@@ -517,7 +632,7 @@ def get_dashboard_layout():
                             ),
                         ],
                         # NOTE: always display:block — no toggling visibility
-                        style={'display': 'block'},
+                        style=_STYLE_PLOTS,
                     ),
 
                 ],
@@ -529,50 +644,60 @@ def get_dashboard_layout():
 # ─────────────────────────────────────────────
 # Helper: build attack-type card columns
 # ─────────────────────────────────────────────
+_ATTACK_CARDS_META = [
+    {'icon': '🌩️', 'name': 'DDoS'},
+    {'icon': '🚫', 'name': 'DoS'},
+    {'icon': '🔍', 'name': 'Port Scan'},
+    {'icon': '🔨', 'name': 'Brute Force'},
+    {'icon': '🤖', 'name': 'Botnet'},
+    {'icon': '🌐', 'name': 'Web Attacks'},
+]
+
+# Card/label styles only differ by selection state, so both variants are
+# built once. Plain dicts (not MappingProxyType): Dash must JSON-encode them.
+# The label inherits its colour from the card so a selection change only
+# has to restyle the card div.
+_CARD_STYLE_BASE = {
+    'padding': '18px 12px',
+    'borderRadius': '12px',
+    'cursor': 'pointer',
+    'transition': 'all 0.25s cubic-bezier(0.4,0,0.2,1)',
+    'textAlign': 'center',
+}
+_STYLE_SELECTED = {
+    **_CARD_STYLE_BASE,
+    'background': f'linear-gradient(145deg, {styles["secondary"]}, #5a3fff)',
+    'border': f'2px solid {styles["secondary"]}',
+    'boxShadow': '0 10px 28px rgba(111,61,255,0.4)',
+    'transform': 'translateY(-4px)',
+    'color': 'white',
+}
+_STYLE_UNSELECTED = {
+    **_CARD_STYLE_BASE,
+    'background': f'linear-gradient(145deg, {styles["card_bg"]}, #363656)',
+    'border': '2px solid transparent',
+    'boxShadow': '0 4px 16px rgba(0,0,0,0.25)',
+    'transform': 'translateY(0)',
+    'color': styles['text'],
+}
+_LABEL_STYLE = {'color': 'inherit', 'fontWeight': '700', 'fontSize': '1rem', 'margin': 0}
+_CARD_ICON_STYLE = {'fontSize': '2rem', 'display': 'block', 'marginBottom': '8px'}
+
+
 def _build_attack_cards(selected_idx=-1):
-    cards_meta = [
-        {'id': 'ddos-card',       'icon': '🌩️', 'name': 'DDoS'},
-        {'id': 'dos-card',        'icon': '🚫', 'name': 'DoS'},
-        {'id': 'portscan-card',   'icon': '🔍', 'name': 'Port Scan'},
-        {'id': 'bruteforce-card', 'icon': '🔨', 'name': 'Brute Force'},
-        {'id': 'botnet-card',     'icon': '🤖', 'name': 'Botnet'},
-        {'id': 'webattacks-card', 'icon': '🌐', 'name': 'Web Attacks'},
-    ]
     cols = []
-    for i, card in enumerate(cards_meta):
+    for i, card in enumerate(_ATTACK_CARDS_META):
         is_sel = (i == selected_idx)
-        card_style = {
-            'background': (
-                f'linear-gradient(145deg, {styles["secondary"]}, #5a3fff)'
-                if is_sel else
-                f'linear-gradient(145deg, {styles["card_bg"]}, #363656)'
-            ),
-            'padding': '18px 12px',
-            'borderRadius': '12px',
-            'cursor': 'pointer',
-            'transition': 'all 0.25s cubic-bezier(0.4,0,0.2,1)',
-            'border': f'2px solid {styles["secondary"]}' if is_sel else '2px solid transparent',
-            'textAlign': 'center',
-            'boxShadow': '0 10px 28px rgba(111,61,255,0.4)' if is_sel else '0 4px 16px rgba(0,0,0,0.25)',
-            'transform': 'translateY(-4px)' if is_sel else 'translateY(0)',
-        }
-        label_style = {
-            'color': 'white' if is_sel else styles['text'],
-            'fontWeight': '700',
-            'fontSize': '1rem',
-            'margin': 0,
-        }
         cols.append(
             dbc.Col(
                 html.Div(
                     [
-                        html.Span(card['icon'],
-                                  style={'fontSize': '2rem', 'display': 'block', 'marginBottom': '8px'}),
-                        html.H6(card['name'], style=label_style),
+                        html.Span(card['icon'], style=_CARD_ICON_STYLE),
+                        html.H6(card['name'], style=_LABEL_STYLE),
                     ],
-                    id=card['id'],
+                    id={'type': 'attack-card', 'idx': i},
                     n_clicks=0,
-                    style=card_style,
+                    style=_STYLE_SELECTED if is_sel else _STYLE_UNSELECTED,
                 ),
                 xs=6, sm=4, md=2,
                 className="attack-col mb-2",
@@ -581,26 +706,27 @@ def _build_attack_cards(selected_idx=-1):
     return cols
 
 
+# The grid is built once; selection only restyles the cards in the browser.
+_DEFAULT_ATTACK_CARDS = _build_attack_cards(-1)
+_ATTACK_CARD_STYLES = {
+    'selected': _STYLE_SELECTED,
+    'unselected': _STYLE_UNSELECTED,
+}
+
+
 # ─────────────────────────────────────────────
 # Callbacks
 # ─────────────────────────────────────────────
 
-# Attack card selection
-@callback(
-    Output('attack-types-grid', 'children', allow_duplicate=True),
-    [Input('ddos-card', 'n_clicks'),
-     Input('dos-card', 'n_clicks'),
-     Input('portscan-card', 'n_clicks'),
-     Input('bruteforce-card', 'n_clicks'),
-     Input('botnet-card', 'n_clicks'),
-     Input('webattacks-card', 'n_clicks')],
+# Attack card selection – runs in the browser (assets/anomaly.js) and only
+# swaps the style of each card div.
+clientside_callback(
+    ClientsideFunction(namespace='anomaly', function_name='selectAttackCard'),
+    Output({'type': 'attack-card', 'idx': ALL}, 'style'),
+    Input({'type': 'attack-card', 'idx': ALL}, 'n_clicks'),
+    State('attack-card-styles', 'data'),
     prevent_initial_call=True,
 )
-def update_attack_selection(ddos, dos, portscan, bruteforce, botnet, webattacks):
-    clicks = [ddos or 0, dos or 0, portscan or 0,
-              bruteforce or 0, botnet or 0, webattacks or 0]
-    selected_idx = clicks.index(max(clicks)) if max(clicks) > 0 else -1
-    return _build_attack_cards(selected_idx)
 
 
 # Smart report generator
@@ -612,200 +738,198 @@ def update_attack_selection(ddos, dos, portscan, bruteforce, botnet, webattacks)
      Output('highest-attack-prob', 'children'),
      Output('highest-risk-badge', 'children'),
      Output('attack-trend-graph', 'figure'),
-     Output('attack-summary-table', 'data'),
+     Output('attack-summary-table', 'children'),
      Output('report-timestamp', 'children')],
     Input('anomalous-data-store', 'data'),
     [State('stored-data', 'data'),
-     State('total-anomalies-kpi', 'children')],
+     State('total-anomalies-kpi', 'children'),
+     State('attack-trend-data', 'data')],
     prevent_initial_call=True,
 )
-def generate_smart_report(anomalous_json, stored_data, total_anomalies_str):
-    _empty = _empty_fig("No anomaly data – upload a CSV to generate report")
-
+def generate_smart_report(anomalous_json, stored_data, total_anomalies_str, prev_trend_data):
     if not anomalous_json:
         return (None, None, "—", "0", "0%",
-                html.Div("—", style={'color': styles['text']}),
-                _empty, [], "No report generated")
+                _PLACEHOLDER_BADGE,
+                _EMPTY_FIG_REPORT, _EMPTY_SUMMARY_TABLE, "No report generated")
 
     try:
         if isinstance(anomalous_json, str):
-            anomalous_data = json.loads(anomalous_json)
+            anomalous_data = orjson.loads(anomalous_json)
         else:
             anomalous_data = anomalous_json
 
-        if isinstance(anomalous_data, str):
-            df_anomalies = pd.read_json(anomalous_data, orient='split')
-        else:
-            df_anomalies = pd.read_json(json.dumps(anomalous_data), orient='split')
-
-        total_anomalies = max(len(df_anomalies), 0)
+        # Only the row count is needed, and the store already carries it;
+        # the anomalous rows are only rebuilt for the CSV export.
+        total_anomalies = int(anomalous_data['rows'])
     except Exception:
         return (None, None, "—", "0", "0%",
-                html.Div("—", style={'color': styles['text']}),
-                _empty, [], "Invalid data format")
+                _PLACEHOLDER_BADGE,
+                _EMPTY_FIG_REPORT, _EMPTY_SUMMARY_TABLE, "Invalid data format")
 
     attack_types = ['DDoS', 'DoS', 'Port Scan', 'Brute Force', 'Botnet', 'Web Attacks']
-    np.random.seed(42 + total_anomalies)
+    rng = np.random.default_rng(42 + total_anomalies)
 
+    # One Poisson draw per attack type; DDoS (first) gets an extra burst
+    # that scales with the anomaly volume. Poisson draws are never negative.
     total_attacks = max(1, total_anomalies // 3)
-    attack_counts = {}
-    for attack in attack_types:
-        base_count = np.random.poisson(total_attacks / len(attack_types))
-        if attack == 'DDoS':
-            count = max(0, base_count + np.random.poisson(total_anomalies * 0.1))
-        else:
-            count = max(0, base_count)
-        attack_counts[attack] = count
-
-    report_data, trend_data = [], []
-    current_time = pd.Timestamp.now()
-
-    for attack, count in attack_counts.items():
-        if count > 0:
-            probability = (count / total_anomalies * 100) if total_anomalies > 0 else 0
-            risk_level = classify_risk(count, total_anomalies)
-            report_data.append({'attack_type': attack, 'count': count,
-                                 'probability': f"{probability:.1f}%", 'risk_level': risk_level})
-            trend_data.append({'timestamp': current_time.isoformat(),
-                                'attack_type': attack, 'count': count})
+    counts = rng.poisson(total_attacks / len(attack_types), size=len(attack_types))
+    counts[0] += rng.poisson(total_anomalies * 0.1)
+
+    # Probabilities and risk codes for every attack type in one compiled pass.
+    # Narrow dtypes: counts fit int32 and one-decimal percentages need no float64.
+    counts = counts.astype(np.int32)
+    present = counts > 0
+    attacks = [attack for attack, keep in zip(attack_types, present) if keep]
+    counts = counts[present]
+    probabilities, risk_codes = compute_report(counts, total_anomalies, HIGH_RISK_RATIO, MEDIUM_RISK_RATIO)
+    risk_levels = _RISK_LEVELS[risk_codes]
+
+    timestamp_iso = datetime.now().isoformat()
+    # Column lists (one per _REPORT_FIELDS entry) go into the report store as-is;
+    # the row dicts are only needed for the on-screen summary.
+    report_columns = {
+        'attack_type': attacks,
+        'count':       counts.tolist(),
+        'probability': [f"{probability:.1f}%" for probability in probabilities.tolist()],
+        'risk_level':  risk_levels.tolist(),
+    }
+    report_data = [
+        dict(zip(_REPORT_FIELDS, row))
+        for row in zip(*(report_columns[field] for field in _REPORT_FIELDS))
+    ]
+    trend_data = [
+        {'timestamp': timestamp_iso, 'attack_type': row['attack_type'], 'count': row['count']}
+        for row in report_data
+    ]
 
     if not report_data:
         return (None, None, "No Threats", "0", "0%",
-                html.Div("🟢 LOW RISK",
-                         style={'color': styles['low_risk'], 'fontSize': '1.1rem', 'fontWeight': 'bold'}),
-                _empty, [],
+                _NO_THREAT_BADGE,
+                _EMPTY_FIG_REPORT, _EMPTY_SUMMARY_TABLE,
                 datetime.now().strftime("%B %d, %Y - %I:%M %p"))
 
-    highest = max(report_data, key=lambda x: x['count'])
+    highest = _argmax_count(report_data)
 
-    risk_colors = {'High': styles['high_risk'], 'Medium': styles['medium_risk'], 'Low': styles['low_risk']}
-    risk_icon = "🔴" if highest['risk_level'] == 'High' else "🟡" if highest['risk_level'] == 'Medium' else "🟢"
-    risk_badge = html.Div([
-        html.Span(f"{risk_icon} ", style={'fontSize': '1.6rem', 'marginRight': '6px'}),
-        html.Span(
-            f"{highest['risk_level']} RISK",
-            style={
-                'backgroundColor': risk_colors[highest['risk_level']],
-                'color': 'white' if highest['risk_level'] != 'Medium' else 'black',
-                'padding': '8px 18px',
-                'borderRadius': '20px',
-                'fontWeight': 'bold',
-                'fontSize': '1rem',
-            },
-        ),
-    ], style={'textAlign': 'center', 'padding': '8px'})
-
-    trend_df = pd.DataFrame(trend_data)
-    if len(trend_df) > 0:
-        fig = px.bar(
-            trend_df, x='attack_type', y='count',
-            title="Current Attack Distribution",
-            color='count',
-            color_continuous_scale=['#00bfa5', '#ffc400', '#ff006e'],
-        )
+    risk_badge = _RISK_BADGES[highest['risk_level']]
+
+    # Once the bar chart is on screen only its values change: patch the trace
+    # so plotly.js diffs it in place (react path) instead of re-plotting.
+    if prev_trend_data:
+        counts_list = [row['count'] for row in trend_data]
+        fig = Patch()
+        fig['data'][0]['x'] = [row['attack_type'] for row in trend_data]
+        fig['data'][0]['y'] = counts_list
+        fig['data'][0]['marker']['color'] = counts_list
     else:
-        fig = _empty_fig()
-
-    fig.update_layout(
-        plot_bgcolor=styles['card_bg'],
-        paper_bgcolor=styles['card_bg'],
-        font_color=styles['text'],
-        height=GRAPH_HEIGHT,
-        showlegend=False,
-        title_font_size=16,
-        xaxis_title="Attack Type",
-        yaxis_title="Incident Count",
-        margin=dict(l=20, r=20, t=50, b=20),
-    )
+        fig = _bar_figure(tuple((row['attack_type'], row['count']) for row in trend_data))
 
     timestamp = datetime.now().strftime("%B %d, %Y - %I:%M %p")
-    return (report_data, trend_data,
+    # The highest row travels with the report so the download doesn't rescan it.
+    return ({**report_columns, 'highest': highest}, trend_data,
             highest['attack_type'], f"{highest['count']:,}", highest['probability'],
-            risk_badge, fig, report_data, timestamp)
+            risk_badge, fig, _summary_table(report_data), timestamp)
 
 
-# Download report
-@callback(
-    Output("smart-report-download", "data"),
-    Input("download-pdf-btn", "n_clicks"),
-    [State('smart-report-data', 'data'),
-     State('report-timestamp', 'children')],
-    prevent_initial_call=True,
+# ─────────────────────────────────────────────
+# HTML report template
+# Parsed once at import; each download only
+# substitutes the per-report values.
+# ─────────────────────────────────────────────
+# Positional: {0} is the lower-cased risk level used as the row's CSS class.
+_REPORT_ROW = (
+    '<tr class="{0}">'
+    '<td><strong>{1}</strong></td>'
+    '<td><strong>{2:,}</strong></td>'
+    '<td>{3}</td>'
+    '<td>{4}</td></tr>'
 )
-def generate_html_report(n_clicks, report_data, timestamp):
-    if not report_data:
-        return no_update
 
-    highest = max(report_data, key=lambda x: x['count'])
+_REPORT_FIELDS = ('attack_type', 'count', 'probability', 'risk_level')
 
-    rows_html = "\n".join(
-        f'<tr class="{r["risk_level"].lower()}">'
-        f'<td><strong>{r["attack_type"]}</strong></td>'
-        f'<td><strong>{r["count"]:,}</strong></td>'
-        f'<td>{r["probability"]}</td>'
-        f'<td>{r["risk_level"]}</td></tr>'
-        for r in report_data
-    )
+# The report links assets/report.css by absolute URL (downloaded files are
+# opened from disk). Set REPORT_INLINE_CSS for fully self-contained reports.
+REPORT_INLINE_CSS = False
+REPORT_CSS_ASSET = 'report.css'
+_REPORT_CSS = (Path(__file__).parent / 'assets' / REPORT_CSS_ASSET).read_text(encoding='utf-8')
 
-    html_content = f"""<!DOCTYPE html>
+_REPORT_TEMPLATE = Template("""<!DOCTYPE html>
 <html>
 <head>
 <meta charset="UTF-8">
-<title>SOC Security Report – {highest['attack_type']}</title>
-<style>
-*{{margin:0;padding:0;box-sizing:border-box}}
-body{{background:linear-gradient(135deg,#1a1a2e,#16213e,#0f3460);color:#e0e0e0;
-     font-family:-apple-system,BlinkMacSystemFont,'Inter',sans-serif;padding:40px;line-height:1.6}}
-.container{{max-width:1100px;margin:0 auto}}
-.header{{text-align:center;background:linear-gradient(135deg,#6f3dff,#0f4c75);
-          padding:36px;border-radius:18px;margin-bottom:36px;
-          box-shadow:0 20px 60px rgba(111,61,255,0.3)}}
-.header h1{{font-size:2.4rem;font-weight:700;margin-bottom:8px}}
-.timestamp{{color:#a0a0a0;font-size:1rem}}
-.highest{{background:linear-gradient(145deg,#ff006e,#ff4d82);padding:30px;
-           border-radius:18px;text-align:center;margin:36px 0;
-           box-shadow:0 25px 50px rgba(255,0,110,0.4)}}
-.highest h2{{font-size:1.6rem;margin-bottom:12px;color:white}}
-.highest h1{{font-size:3rem;margin:16px 0;color:white;font-weight:800}}
-.stats{{display:flex;justify-content:center;gap:36px;margin-top:16px;flex-wrap:wrap}}
-.stat-value{{font-size:1.8rem;font-weight:700;color:#00ff88}}
-table{{width:100%;border-collapse:collapse;background:rgba(42,42,74,0.95);
-       margin-top:28px;border-radius:14px;overflow:hidden;
-       box-shadow:0 20px 40px rgba(0,0,0,0.4)}}
-th{{background:linear-gradient(145deg,#0f4c75,#1a5a8c);color:white;padding:18px;
-    text-align:left;font-weight:600;font-size:14px;border-bottom:3px solid rgba(111,61,255,0.3)}}
-td{{padding:16px 18px;border-bottom:1px solid rgba(76,76,108,0.5);font-size:13px}}
-.high{{background:rgba(255,0,110,0.8)!important;color:white!important;font-weight:700}}
-.medium{{background:rgba(255,196,0,0.8)!important;color:black!important;font-weight:700}}
-.low{{background:rgba(0,191,165,0.8)!important;color:white!important;font-weight:700}}
-.footer{{text-align:center;margin-top:50px;color:#888;font-size:12px;
-          padding:24px;border-top:1px solid rgba(76,76,108,0.3)}}
-@media(max-width:600px){{.stats{{flex-direction:column;gap:16px}}.header h1{{font-size:1.8rem}}}}
-</style>
+<title>SOC Security Report – $attack_type</title>
+$stylesheet
 </head>
 <body>
 <div class="container">
   <div class="header">
     <h1>🚨 SOC SECURITY REPORT</h1>
-    <div class="timestamp">Generated: {timestamp}</div>
+    <div class="timestamp">Generated: $timestamp</div>
   </div>
   <div class="highest">
     <h2>🔴 HIGHEST THREAT DETECTED</h2>
-    <h1>{highest['attack_type']}</h1>
+    <h1>$attack_type</h1>
     <div class="stats">
-      <div class="stat"><div class="stat-value">{highest['count']:,}</div><div>INCIDENTS</div></div>
-      <div class="stat"><div class="stat-value">{highest['probability']}</div><div>PROBABILITY</div></div>
-      <div class="stat"><div class="stat-value" style="color:#ffaa00">{highest['risk_level']}</div><div>RISK LEVEL</div></div>
+      <div class="stat"><div class="stat-value">$count</div><div>INCIDENTS</div></div>
+      <div class="stat"><div class="stat-value">$probability</div><div>PROBABILITY</div></div>
+      <div class="stat"><div class="stat-value" style="color:#ffaa00">$risk_level</div><div>RISK LEVEL</div></div>
     </div>
   </div>
   <table>
     <thead><tr><th>Attack Type</th><th>Total Count</th><th>Probability</th><th>Risk Level</th></tr></thead>
-    <tbody>{rows_html}</tbody>
+    <tbody>$rows</tbody>
   </table>
-  <div class="footer">Generated by Anomaly Detection Dashboard | Total entries: {len(report_data)} | {timestamp}</div>
+  <div class="footer">Generated by Anomaly Detection Dashboard | Total entries: $n | $timestamp</div>
 </div>
 </body>
-</html>"""
+</html>""")
+
+
+@lru_cache(maxsize=32)
+def _build_html(report_rows, highest_row, timestamp, stylesheet):
+    """Render the HTML report; rows and the highest row are _REPORT_FIELDS tuples."""
+    highest = dict(zip(_REPORT_FIELDS, highest_row))
+
+    rows_html = "\n".join(
+        _REPORT_ROW.format(risk.lower(), attack, count, probability, risk)
+        for attack, count, probability, risk in report_rows
+    )
+
+    return _REPORT_TEMPLATE.substitute(
+        attack_type=highest['attack_type'],
+        count=f"{highest['count']:,}",
+        probability=highest['probability'],
+        risk_level=highest['risk_level'],
+        timestamp=timestamp,
+        stylesheet=stylesheet,
+        rows=rows_html,
+        n=len(report_rows),
+    )
+
+
+# Download report
+@callback(
+    Output("smart-report-download", "data"),
+    Input("download-pdf-btn", "n_clicks"),
+    [State('smart-report-data', 'data'),
+     State('report-timestamp', 'children')],
+    running=[(Output("download-pdf-btn", "disabled"), True, False)],
+    prevent_initial_call=True,
+)
+def generate_html_report(n_clicks, report, timestamp):
+    if not report:
+        return no_update
+
+    highest = report['highest']
+
+    # Hashable snapshot of the report, so repeated downloads hit the cache.
+    report_rows = tuple(zip(*(report[field] for field in _REPORT_FIELDS)))
+    highest_row = tuple(highest[field] for field in _REPORT_FIELDS)
+    if REPORT_INLINE_CSS:
+        stylesheet = f'<style>\n{_REPORT_CSS}</style>'
+    else:
+        css_url = request.host_url.rstrip('/') + dash.get_asset_url(REPORT_CSS_ASSET)
+        stylesheet = f'<link rel="stylesheet" href="{css_url}">'
+    html_content = _build_html(report_rows, highest_row, timestamp, stylesheet)
 
     filename = (
         f"SOC_Security_Report_{highest['attack_type'].replace(' ', '_')}_"
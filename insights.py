@@ -2,9 +2,9 @@
 import dash
 from dash import html, dcc, callback, Input, Output, State
 import dash_bootstrap_components as dbc
+from functools import lru_cache
 import plotly.graph_objects as go
 import numpy as np
-import random
 
 # ---------------- Styles ---------------- #
 styles = {
@@ -18,7 +18,24 @@ styles = {
     'muted': '#9aa4bf'
 }
 
+_RNG = np.random.default_rng()
+# Marker colour per severity step: 0 = at/below threshold, 1 = above, 2 = above threshold+1.
+_COLOR_LUT = np.array([styles['accent'], styles['warning'], styles['danger']])
+
+# Severity badges indexed by np.digitize level: 0 = Low, 1 = Medium, 2 = High.
+_BADGES = (
+    dbc.Badge("Low", color="secondary", className="ml-1"),
+    dbc.Badge("Medium", color="warning", className="ml-1"),
+    dbc.Badge("High", color="danger", className="ml-1"),
+)
+
+_KPI_CARD_STYLE = {'background': 'linear-gradient(135deg,#1f1a2d,#261d3a)','boxShadow':'0 4px 20px rgba(0,0,0,0.6)'}
+
+_TREND_LAYOUT = dict(template="plotly_dark", paper_bgcolor=styles['card'], plot_bgcolor=styles['card'],
+                     font_color=styles['text'], height=450, margin=dict(l=30,r=30,t=40,b=30))
+
 # ---------------- Layout ---------------- #
+@lru_cache(maxsize=None)
 def get_insights_layout():
     return dbc.Container([
         # Interval for live updates
@@ -35,23 +52,23 @@ def get_insights_layout():
             dbc.Col(dbc.Card(dbc.CardBody([
                 html.H6("🔥 Max Z-Score", className="card-title", style={'color': styles['accent']}),
                 html.H2(id="max-z", style={'color': styles['danger'], 'fontWeight': 'bold'}),
-            ]), style={'background': 'linear-gradient(135deg,#1f1a2d,#261d3a)','boxShadow':'0 4px 20px rgba(0,0,0,0.6)'}), md=3),
+            ]), style=_KPI_CARD_STYLE), md=3),
 
             dbc.Col(dbc.Card(dbc.CardBody([
                 html.H6("⚡ Critical Index", className="card-title", style={'color': styles['accent']}),
                 html.H2(id="critical-idx", style={'color': styles['warning'], 'fontWeight': 'bold'}),
-            ]), style={'background': 'linear-gradient(135deg,#1f1a2d,#261d3a)','boxShadow':'0 4px 20px rgba(0,0,0,0.6)'}), md=3),
+            ]), style=_KPI_CARD_STYLE), md=3),
 
             dbc.Col(dbc.Card(dbc.CardBody([
                 html.H6("📊 Total Anomalies", className="card-title", style={'color': styles['accent']}),
                 html.H2(id="total-anomalies", style={'color': styles['success'], 'fontWeight': 'bold'}),
-            ]), style={'background': 'linear-gradient(135deg,#1f1a2d,#261d3a)','boxShadow':'0 4px 20px rgba(0,0,0,0.6)'}), md=3),
+            ]), style=_KPI_CARD_STYLE), md=3),
 
             dbc.Col(dbc.Card(dbc.CardBody([
                 html.H6("⚙ Threshold", className="card-title", style={'color': styles['accent']}),
                 dcc.Slider(id="threshold-slider", min=0, max=6, step=0.1, value=3,
                            marks={i:str(i) for i in range(0,7)}, tooltip={"placement":"top","always_visible":True})
-            ]), style={'background': 'linear-gradient(135deg,#1f1a2d,#261d3a)','boxShadow':'0 4px 20px rgba(0,0,0,0.6)'}), md=3)
+            ]), style=_KPI_CARD_STYLE), md=3)
         ], className="mb-4"),
 
         # Trend Graph
@@ -90,11 +107,12 @@ def get_insights_layout():
 def update_dashboard(n, threshold):
 
     # Simulated dynamic Z-score data
-    zscores = np.array([round(random.uniform(2,5.5),2) for _ in range(20)])
+    zscores = np.round(_RNG.uniform(2, 5.5, size=20), 2)
     idx = np.arange(1,len(zscores)+1)
 
     # ---------------- Trend Graph ---------------- #
-    colors = [styles['danger'] if z>threshold+1 else styles['warning'] if z>threshold else styles['accent'] for z in zscores]
+    above = zscores > threshold
+    colors = _COLOR_LUT[above.astype(int) + (zscores>threshold+1).astype(int)].tolist()
     fig = go.Figure()
     fig.add_trace(go.Scatter(
         x=idx, y=zscores, mode='lines+markers',
@@ -103,43 +121,40 @@ def update_dashboard(n, threshold):
         hovertemplate="Index: %{x}<br>Z-Score: %{y}<extra></extra>"
     ))
     fig.add_hline(y=threshold, line_dash="dash", line_color=styles['danger'], annotation_text=f"Threshold={threshold}")
-    fig.update_layout(template="plotly_dark", paper_bgcolor=styles['card'], plot_bgcolor=styles['card'],
-                      font_color=styles['text'], height=450, margin=dict(l=30,r=30,t=40,b=30))
+    fig.update_layout(**_TREND_LAYOUT)
 
     # ---------------- Top Anomalies Table ---------------- #
-    top_idx = np.argsort(zscores)[-10:][::-1]
+    top_idx = np.argsort(zscores)[-1:-11:-1]
+    top_z = zscores[top_idx]
+    # right=True keeps the strict '>' of the thresholds: z > threshold+1 is High.
+    severity = np.digitize(top_z, [threshold, threshold+1], right=True)
+    top = list(zip(top_idx.tolist(), top_z.tolist(), severity.tolist()))
+
     table_header = [html.Thead(html.Tr([html.Th("Rank"), html.Th("Index"), html.Th("Z-Score"), html.Th("Severity")]))]
-    table_rows = []
-    for rank,i in enumerate(top_idx,1):
-        z = zscores[i]
-        if z>threshold+1:
-            severity = dbc.Badge("High", color="danger", className="ml-1")
-        elif z>threshold:
-            severity = dbc.Badge("Medium", color="warning", className="ml-1")
-        else:
-            severity = dbc.Badge("Low", color="secondary", className="ml-1")
-        table_rows.append(html.Tr([html.Td(rank), html.Td(i+1), html.Td(f"{z:.2f}"), html.Td(severity)]))
+    table_rows = [
+        html.Tr([html.Td(rank), html.Td(i+1), html.Td(f"{z:.2f}"), html.Td(_BADGES[sev])])
+        for rank, (i, z, sev) in enumerate(top, 1)
+    ]
     table_body = [html.Tbody(table_rows)]
 
     # ---------------- AI Explanation Panel ---------------- #
-    explain_items = []
-    for i in top_idx:
-        explain_items.append(
-            dbc.Collapse(
-                dbc.Card([
-                    dbc.CardHeader(f"Index {i+1} Explanation", style={'color': styles['accent']}),
-                    dbc.CardBody(f"Z-Score = {zscores[i]:.2f}. Detected anomaly above threshold. "
-                                 f"Recommendation: Investigate this metric and compare with historical patterns.")
-                ]),
-                id=f"collapse-{i+1}",
-                is_open=True
-            )
+    explain_items = [
+        dbc.Collapse(
+            dbc.Card([
+                dbc.CardHeader(f"Index {i+1} Explanation", style={'color': styles['accent']}),
+                dbc.CardBody(f"Z-Score = {z:.2f}. Detected anomaly above threshold. "
+                             f"Recommendation: Investigate this metric and compare with historical patterns.")
+            ]),
+            id=f"collapse-{i+1}",
+            is_open=True
         )
+        for i, z, _ in top
+    ]
 
     # ---------------- Summary Metrics ---------------- #
     max_z = f"{zscores.max():.2f}"
     critical_idx = f"{zscores.argmax()+1}"
-    total_anomalies = np.sum(zscores>threshold)
+    total_anomalies = int(np.count_nonzero(above))
 
     return fig, table_header+table_body, explain_items, max_z, critical_idx, total_anomalies
 
@@ -0,0 +1,81 @@
+import numpy as np
+from numba import config, njit, prange
+
+# ──────────────────────────────────────────────
+# Numba kernels for the anomaly pipeline
+# Compiled on first import and cached to disk
+# (cache=True), so later worker starts skip the
+# JIT cost. fastmath leaves out 'nnan'/'ninf':
+# uploaded CSVs contain missing values and the
+# NaN checks below must not be optimised away.
+# ──────────────────────────────────────────────
+_FASTMATH = {'nsz', 'arcp', 'contract', 'afn', 'reassoc'}
+
+# gunicorn runs several request threads per worker (see Procfile), so the
+# parallel kernels can be launched concurrently. The fallback 'workqueue'
+# layer aborts the process when that happens; require a thread-safe one
+# (tbb, from requirements.txt, or OpenMP).
+config.THREADING_LAYER = 'threadsafe'
+
+
+@njit(parallel=True, fastmath=_FASTMATH, error_model='numpy', cache=True)
+def zscore_columns(a):
+    """Column-wise z-scores (ddof=0, NaN-aware) of a 2-D float32 array, one column per thread."""
+    n, m = a.shape
+    # Filled as (column, row) and returned transposed, so each column is contiguous.
+    out = np.empty((m, n), dtype=np.float32)
+    for j in prange(m):
+        # Welford: mean and sum of squared deviations in one read of the column,
+        # without the cancellation of a naive sum/sum-of-squares.
+        mu = 0.0
+        sq = 0.0
+        count = 0
+        for i in range(n):
+            v = a[i, j]
+            if not np.isnan(v):
+                count += 1
+                delta = v - mu
+                mu += delta / count
+                sq += delta * (v - mu)
+        sigma = np.sqrt(sq / count)
+
+        for i in range(n):
+            out[j, i] = (a[i, j] - mu) / sigma
+    return out.T
+
+
+@njit(parallel=True, fastmath=_FASTMATH, error_model='numpy', cache=True)
+def threshold_mask(z, threshold):
+    """Boolean mask of |z| > threshold for a 1-D z-score column (NaN rows are False)."""
+    out = np.empty(z.shape[0], dtype=np.bool_)
+    for i in prange(z.shape[0]):
+        out[i] = abs(z[i]) > threshold
+    return out
+
+
+@njit(cache=True)
+def compute_report(counts, total, high_ratio, medium_ratio):
+    """Probability (%) and risk code (0=Low, 1=Medium, 2=High) per attack count."""
+    n = counts.shape[0]
+    probs = np.zeros(n, dtype=np.float32)
+    risks = np.zeros(n, dtype=np.int8)
+    if total == 0:
+        return probs, risks
+    for i in range(n):
+        ratio = counts[i] / total
+        probs[i] = ratio * 100.0
+        if ratio > high_ratio:
+            risks[i] = 2
+        elif ratio > medium_ratio:
+            risks[i] = 1
+    return probs, risks
+
+
+# Warm the JIT at import so the first upload doesn't pay for compilation.
+# Argument types must match the real calls: app.py passes a Fortran-ordered
+# float32 matrix, which Numba types differently from a C-ordered one (a
+# single-column upload is both, and is typed as C).
+zscore_columns(np.zeros((2, 2), dtype=np.float32, order='F'))
+zscore_columns(np.zeros((2, 1), dtype=np.float32))
+threshold_mask(np.zeros(1, dtype=np.float32), 3.0)
+compute_report(np.zeros(1, dtype=np.int32), 1, 0.5, 0.2)
@@ -1,79 +1,58 @@
 from dash import html, dcc
 from dash.dependencies import Input, Output, State
 import dash_bootstrap_components as dbc
+from functools import lru_cache
+import bcrypt
+from theme import styles, CYBER_BG, GLASS_STYLE, TITLE_STYLE, INPUT_STYLE, BUTTON_STYLE, LINK_STYLE
 
 # ======================
 # TEMP USER DATABASE
 # ======================
+# Passwords are stored as bcrypt hashes, never in plain text.
+BCRYPT_ROUNDS = 10
+
+
+def hash_password(password):
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=BCRYPT_ROUNDS))
+
+
 USERS_DB = {
-    'admin': {"password": "admin123", "email": "admin@gmail.com"},
-    'user': {"password": "user123", "email": "user@gmail.com"}
+    'admin': {"password": hash_password("admin123"), "email": "admin@gmail.com"},
+    'user': {"password": hash_password("user123"), "email": "user@gmail.com"}
 }
 
-styles = {
-    "bg": "#0b0f1a",
-    "card": "rgba(18,25,44,0.75)",
-    "primary": "#00e5ff",
-    "secondary": "#6c63ff",
-    "danger": "#ff4d6d",
-    "success": "#00ffcc",
-    "text": "#e6e6e6"
-}
+# Checked against unknown usernames so a miss costs the same as a wrong password.
+_DUMMY_HASH = hash_password("")
 
 # ======================
-# SHARED BACKGROUND
+# GLASS CARD
 # ======================
-CYBER_BG = {
-    "minHeight": "100vh",
-    "background": """
-        radial-gradient(circle at 20% 20%, rgba(0,229,255,.15), transparent 40%),
-        radial-gradient(circle at 80% 30%, rgba(108,99,255,.15), transparent 40%),
-        linear-gradient(135deg, #05070f 0%, #0b0f1a 40%, #000 100%)
-    """,
-    "display": "flex",
-    "justifyContent": "center",
-    "alignItems": "center"
-}
-
 def glass_card(children):
-    return dbc.Card(
-        children,
-        style={
-            "width": "420px",
-            "padding": "2.5rem",
-            "background": styles["card"],
-            "borderRadius": "18px",
-            "backdropFilter": "blur(14px)",
-            "boxShadow": "0 0 35px rgba(0,229,255,0.35)",
-            "border": "1px solid rgba(0,229,255,0.25)",
-        }
-    )
+    return dbc.Card(children, style=GLASS_STYLE)
 
 # ======================
 # LOGIN PAGE
 # ======================
+# Login/register pages are static: each is built once and then reused.
+@lru_cache(maxsize=None)
 def get_login_layout():
     return html.Div(
         style=CYBER_BG,
         children=[
             glass_card([
-                html.H3("Secure Login", style={"color": styles["primary"], "textAlign": "center"}),
+                html.H3("Secure Login", style=TITLE_STYLE),
                 html.P("Network Anomaly Detection System",
                        style={"textAlign": "center", "color": styles["text"], "opacity": .8}),
 
-                dbc.Input(id="login-username", placeholder="Username", className="mb-3",
-                          style={"backgroundColor": styles["bg"], "color": "white"}),
+                dbc.Input(id="login-username", placeholder="Username", className="mb-3", style=INPUT_STYLE),
 
-                dbc.Input(id="login-password", placeholder="Password", type="password", className="mb-3",
-                          style={"backgroundColor": styles["bg"], "color": "white"}),
+                dbc.Input(id="login-password", placeholder="Password", type="password", className="mb-3", style=INPUT_STYLE),
 
-                dbc.Button("LOGIN", id="login-btn", className="w-100 mb-2",
-                           style={"background": "linear-gradient(90deg,#00e5ff,#6c63ff)", "border": "none"}),
+                dbc.Button("LOGIN", id="login-btn", className="w-100 mb-2", style=BUTTON_STYLE),
 
                 html.Div(id="login-message", style={"textAlign": "center", "color": styles["danger"], "minHeight": "22px"}),
 
-                dcc.Link("New User? Register", href="/register",
-                         style={"display": "block", "textAlign": "center", "marginTop": "12px", "color": styles["secondary"]})
+                dcc.Link("New User? Register", href="/register", style=LINK_STYLE)
             ])
         ]
     )
@@ -81,30 +60,26 @@ def get_login_layout():
 # ======================
 # REGISTER PAGE
 # ======================
+@lru_cache(maxsize=None)
 def get_register_layout():
     return html.Div(
         style=CYBER_BG,
         children=[
             glass_card([
-                html.H3("Create Account", style={"color": styles["primary"], "textAlign": "center"}),
+                html.H3("Create Account", style=TITLE_STYLE),
 
-                dbc.Input(id="reg-username", placeholder="Username", className="mb-2",
-                          style={"backgroundColor": styles["bg"], "color": "white"}),
+                dbc.Input(id="reg-username", placeholder="Username", className="mb-2", style=INPUT_STYLE),
 
-                dbc.Input(id="reg-email", placeholder="Email", type="email", className="mb-2",
-                          style={"backgroundColor": styles["bg"], "color": "white"}),
+                dbc.Input(id="reg-email", placeholder="Email", type="email", className="mb-2", style=INPUT_STYLE),
 
-                dbc.Input(id="reg-password", placeholder="Password", type="password", className="mb-3",
-                          style={"backgroundColor": styles["bg"], "color": "white"}),
+                dbc.Input(id="reg-password", placeholder="Password", type="password", className="mb-3", style=INPUT_STYLE),
 
-                dbc.Button("REGISTER", id="register-btn", className="w-100",
-                           style={"background": "linear-gradient(90deg,#00e5ff,#6c63ff)", "border": "none"}),
+                dbc.Button("REGISTER", id="register-btn", className="w-100", style=BUTTON_STYLE),
 
                 html.Div(id="register-message",
                          style={"textAlign": "center", "marginTop": "10px", "color": styles["success"], "minHeight": "22px"}),
 
-                dcc.Link("⬅ Back to Login", href="/login",
-                         style={"display": "block", "textAlign": "center", "marginTop": "12px", "color": styles["secondary"]})
+                dcc.Link("⬅ Back to Login", href="/login", style=LINK_STYLE)
             ])
         ]
     )
@@ -129,7 +104,7 @@ def register_login_callbacks(app):
         if username in USERS_DB:
             return "❌ Username already exists"
 
-        USERS_DB[username] = {"password": password, "email": email}
+        USERS_DB[username] = {"password": hash_password(password), "email": email}
         return "✅ Registered! Go back and login."
 
     @app.callback(
@@ -144,7 +119,9 @@ def register_login_callbacks(app):
         if not username or not password:
             return {"logged_in": False}, " Enter username & password"
 
-        if username in USERS_DB and USERS_DB[username]["password"] == password:
+        user = USERS_DB.get(username)
+        stored = user["password"] if user is not None else _DUMMY_HASH
+        if bcrypt.checkpw(password.encode(), stored) and user is not None:
             return {"logged_in": True}, "✅ Login successful!"
 
         return {"logged_in": False}, "❌ Invalid credentials"
@@ -1,11 +1,13 @@
 from dash import Dash, html, dcc
 import dash_bootstrap_components as dbc
 from dash.dependencies import Input, Output
+from functools import lru_cache
 
 # Initialize Dash app
 app = Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP])
 server = app.server
 
+@lru_cache(maxsize=None)
 def get_settings_layout():
     return dbc.Container([
 
@@ -0,0 +1,41 @@
+# ======================
+# SHARED THEME
+# ======================
+# Palette and style dicts for the login / register pages, built once at
+# import and reused by every layout that needs them.
+styles = {
+    "bg": "#0b0f1a",
+    "card": "rgba(18,25,44,0.75)",
+    "primary": "#00e5ff",
+    "secondary": "#6c63ff",
+    "danger": "#ff4d6d",
+    "success": "#00ffcc",
+    "text": "#e6e6e6"
+}
+
+CYBER_BG = {
+    "minHeight": "100vh",
+    "background": """
+        radial-gradient(circle at 20% 20%, rgba(0,229,255,.15), transparent 40%),
+        radial-gradient(circle at 80% 30%, rgba(108,99,255,.15), transparent 40%),
+        linear-gradient(135deg, #05070f 0%, #0b0f1a 40%, #000 100%)
+    """,
+    "display": "flex",
+    "justifyContent": "center",
+    "alignItems": "center"
+}
+
+GLASS_STYLE = {
+    "width": "420px",
+    "padding": "2.5rem",
+    "background": styles["card"],
+    "borderRadius": "18px",
+    "backdropFilter": "blur(14px)",
+    "boxShadow": "0 0 35px rgba(0,229,255,0.35)",
+    "border": "1px solid rgba(0,229,255,0.25)",
+}
+
+TITLE_STYLE = {"color": styles["primary"], "textAlign": "center"}
+INPUT_STYLE = {"backgroundColor": styles["bg"], "color": "white"}
+BUTTON_STYLE = {"background": "linear-gradient(90deg,#00e5ff,#6c63ff)", "border": "none"}
+LINK_STYLE = {"display": "block", "textAlign": "center", "marginTop": "12px", "color": styles["secondary"]}